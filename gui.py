@@ -1,17 +1,33 @@
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import itertools
+import json
 import logging
 import os
+import queue
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, features
+
+try:
+    import pyvips  # type: ignore
+except (ImportError, OSError):  # pragma: no cover - pyvips/libvips 为可选依赖
+    pyvips = None
 
 if hasattr(Image, "Resampling"):
     RESAMPLE_LANCZOS = Image.Resampling.LANCZOS
+    RESAMPLE_BILINEAR = Image.Resampling.BILINEAR
+    RESAMPLE_BOX = Image.Resampling.BOX
     RESAMPLE_NEAREST = Image.Resampling.NEAREST
 else:  # pragma: no cover - Pillow < 9 fallback
     RESAMPLE_LANCZOS = Image.LANCZOS
+    RESAMPLE_BILINEAR = Image.BILINEAR
+    RESAMPLE_BOX = Image.BOX
     RESAMPLE_NEAREST = Image.NEAREST
 
 from run import (
@@ -22,57 +38,499 @@ from run import (
     save_config_parser,
 )
 
+_BOOLEAN_STATES = {'1': True, 'yes': True, 'true': True, 'on': True,
+                   '0': False, 'no': False, 'false': False, 'off': False}
+
+THUMBNAIL_SIZE = (120, 120)
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'AutoComicRefiner')
+THUMBNAIL_CACHE_MAX_FILES = 2000
+# WebP 体积约为同等质量 JPEG 的一半；Pillow 未编译 WebP 支持时退回 JPEG
+if features.check('webp'):
+    THUMBNAIL_CACHE_FORMAT, THUMBNAIL_CACHE_EXT, THUMBNAIL_CACHE_SAVE_OPTIONS = 'WEBP', '.webp', {'quality': 70}
+else:  # pragma: no cover - 取决于 Pillow 的编译选项
+    THUMBNAIL_CACHE_FORMAT, THUMBNAIL_CACHE_EXT, THUMBNAIL_CACHE_SAVE_OPTIONS = 'JPEG', '.jpg', {'quality': 85, 'optimize': True}
+# 缩略图条只解码可见区域前后若干张，并限制同时持有的 PhotoImage 数量
+THUMBNAIL_LOOKAHEAD = 5
+# 缩略图直接绘制在 Canvas 上：每张占一个固定宽度的格子，可直接由坐标换算序号
+THUMBNAIL_GAP = 16
+THUMBNAIL_STRIDE = THUMBNAIL_SIZE[0] + THUMBNAIL_GAP
+THUMBNAIL_TOP = 12
+THUMBNAIL_MAX_PHOTOS = 128
+# 目录扫描结果的磁盘缓存：按文件夹保存图片列表与各子目录的修改时间，重新打开时只需逐目录 stat 校验
+SCAN_CACHE_DIR = os.path.join(THUMBNAIL_CACHE_DIR, 'scan')
+SCAN_CACHE_MAX_FILES = 20
+SCAN_CACHE_VERSION = 1
+# 主预览内存缓存：最近浏览的解码结果，来回切换时免去重复解码
+PREVIEW_CACHE_MAX_ENTRIES = 16
+# 解码线程池的任务优先级，数值越小越先执行：当前预览 > 相邻页预取 > 缩略图 > 缓存清理
+DECODE_PRIORITY_PREVIEW = 0
+DECODE_PRIORITY_PREFETCH = 1
+DECODE_PRIORITY_THUMBNAIL = 2
+DECODE_PRIORITY_HOUSEKEEPING = 3
+# 翻页节流间隔（毫秒）：按住方向键时只解码最终停留的页面
+PREVIEW_NAV_DEBOUNCE_MS = 150
+PREVIEW_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# 显示当前页后预取前后各几页，由近及远排队，翻页方向上的下一页最先完成
+PREVIEW_PREFETCH_RADIUS = 2
+# PIL 图像模式对应的每通道位深，用于预览信息面板
+_MODE_BITS_PER_CHANNEL = {
+    '1': 1,
+    'L': 8,
+    'P': 8,
+    'RGB': 8,
+    'RGBA': 8,
+    'CMYK': 8,
+    'YCbCr': 8,
+    'I;16': 16,
+    'I;16B': 16,
+    'I;16L': 16,
+    'I;16S': 16,
+    'I;32': 32,
+    'I': 32,
+    'F': 32,
+}
+
+
+def _parse_bool(value):
+    """按 ConfigParser.getboolean 的规则解析布尔字符串，无法识别时视为 False。"""
+    return _BOOLEAN_STATES.get(value.strip().lower(), False)
+
+
+def _image_content_key(image_path):
+    """根据源文件路径、修改时间与大小生成缓存键，源文件不可访问时返回 None。"""
+    try:
+        stat_result = os.stat(image_path)
+    except OSError:
+        return None
+    key_source = f"{image_path}|{stat_result.st_mtime_ns}|{stat_result.st_size}"
+    return hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _thumbnail_cache_path(key):
+    """返回缓存键对应的缩略图磁盘缓存路径。"""
+    return os.path.join(THUMBNAIL_CACHE_DIR, f"{key}{THUMBNAIL_CACHE_EXT}")
+
+
+def _fit_size(size, bounds):
+    """按比例缩放到不超过 bounds 的尺寸（不放大）。"""
+    width, height = size
+    scale = min(bounds[0] / width, bounds[1] / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _preview_entry_covers(entry, draft_size):
+    """判断预览缓存条目的分辨率是否足以满足当前显示尺寸。"""
+    if entry is None:
+        return False
+    if entry['full_resolution']:
+        return True
+    return entry['draft_size'][0] >= draft_size[0] and entry['draft_size'][1] >= draft_size[1]
+
+
+def _thumbnail_resample(image):
+    """选择缩略图的重采样滤镜：缩小倍数大时用最快的 BOX，其余用 BILINEAR，二者在缩略图尺寸下肉眼难辨。"""
+    if image.mode in ('1', 'P'):
+        return RESAMPLE_NEAREST
+    ratio = max(image.width / THUMBNAIL_SIZE[0], image.height / THUMBNAIL_SIZE[1])
+    return RESAMPLE_BOX if ratio >= 4 else RESAMPLE_BILINEAR
+
+
+_BOX_REDUCE_KERNEL = None  # None 表示尚未尝试加载，False 表示 numpy/numba 不可用
+_BOX_REDUCE_KERNEL_LOCK = threading.Lock()  # 解码池多个线程可能同时首次使用，只编译一次
+
+
+def _box_reduce(arr, factor, out):
+    """块平均下采样内核，写入预先分配的 out；由 _get_box_reduce_kernel 交给 numba 编译。
+
+    不使用 parallel=True：调用方本身运行在多线程解码池中，numba 默认的 workqueue 线程层
+    不允许多个线程同时启动并行内核，并发调用会直接终止进程。
+    """
+    out_h, out_w, channels = out.shape
+    area = factor * factor
+    for y in range(out_h):
+        for x in range(out_w):
+            for c in range(channels):
+                total = 0
+                for dy in range(factor):
+                    for dx in range(factor):
+                        total += arr[y * factor + dy, x * factor + dx, c]
+                out[y, x, c] = (total + area // 2) // area
+
+
+def _get_box_reduce_kernel():
+    """按需导入 numpy/numba 并返回 (numpy, 编译后的块平均下采样内核)，不可用时返回 None。"""
+    global _BOX_REDUCE_KERNEL
+    if _BOX_REDUCE_KERNEL is None:
+        with _BOX_REDUCE_KERNEL_LOCK:
+            if _BOX_REDUCE_KERNEL is None:
+                try:
+                    import numpy as np  # type: ignore
+                    from numba import njit  # type: ignore
+                except ImportError:  # pragma: no cover - numpy/numba 为可选依赖
+                    _BOX_REDUCE_KERNEL = False
+                else:
+                    _BOX_REDUCE_KERNEL = (np, njit(cache=True, fastmath=True)(_box_reduce))
+    return _BOX_REDUCE_KERNEL or None
+
+
+def _numba_box_reduce(image):
+    """用 numba 内核对 RGB/L 图像做整数倍块平均缩小，保留约 2 倍余量给最终重采样；不可用或无需缩小时返回 None。"""
+    factor = int(max(image.width / THUMBNAIL_SIZE[0], image.height / THUMBNAIL_SIZE[1]) / 2)
+    if factor < 2:
+        return None
+    kernel = _get_box_reduce_kernel()
+    if kernel is None:
+        return None
+    global _BOX_REDUCE_KERNEL
+    np, box_reduce = kernel
+    arr = np.asarray(image)
+    if arr.ndim == 2:
+        arr = arr[:, :, np.newaxis]
+    reduced = np.empty((arr.shape[0] // factor, arr.shape[1] // factor, arr.shape[2]), dtype=np.uint8)
+    try:
+        box_reduce(np.ascontiguousarray(arr), factor, reduced)
+    except Exception:
+        # 首次调用才真正编译并定位磁盘缓存：类型推断失败、缓存目录只读（如打包后的安装目录）、
+        # numba/numpy 版本不匹配等都在此抛出；此后不再尝试，由调用方改用 Pillow 缩小
+        _BOX_REDUCE_KERNEL = False
+        return None
+    if image.mode == 'L':
+        return Image.fromarray(reduced[:, :, 0], 'L')
+    return Image.fromarray(reduced, 'RGB')
+
+
+def _pil_image_nbytes(image):
+    """估算 PIL 图像像素数据占用的内存字节数。"""
+    return image.width * image.height * len(image.getbands())
+
+
+def _load_thumbnail_image(image_path, decoded_lookup=None):
+    """返回缩略图 PIL 图像，优先读取磁盘缓存，其次复用已解码的预览图，最后才解码原图。
+
+    decoded_lookup 为可选的 ``缓存键 -> PIL 图像或 None`` 函数，用于取得主预览已解码的图像。
+    """
+    key = _image_content_key(image_path)
+    cache_path = _thumbnail_cache_path(key) if key is not None else None
+    if cache_path is not None and os.path.isfile(cache_path):
+        try:
+            with Image.open(cache_path) as cached_img:
+                cached_img.load()
+            os.utime(cache_path)  # 刷新修改时间，供 LRU 清理判断
+            return cached_img
+        except Exception:
+            pass
+
+    thumb_img = None
+    source_img = decoded_lookup(key) if decoded_lookup is not None and key is not None else None
+    if source_img is not None:
+        thumb_img = source_img.resize(
+            _fit_size(source_img.size, THUMBNAIL_SIZE), _thumbnail_resample(source_img), reducing_gap=2.0)
+    if thumb_img is None and pyvips is not None:
+        try:
+            thumb_img = _vips_thumbnail(image_path, THUMBNAIL_SIZE)
+        except Exception:
+            thumb_img = None
+    if thumb_img is None:
+        try:
+            with Image.open(image_path) as thumb_img:
+                thumb_img.draft('RGB', THUMBNAIL_SIZE)  # JPEG 直接按 1/2~1/8 比例解码
+                thumb_img.load()
+                if thumb_img.format in ('BMP', 'TIFF') and thumb_img.mode in ('RGB', 'L'):
+                    # 未压缩格式解码很快，耗时主要在下采样上，可选地交给 numba 内核
+                    thumb_img = _numba_box_reduce(thumb_img) or thumb_img
+                resample = _thumbnail_resample(thumb_img)
+                if thumb_img.mode in ('1', 'P'):
+                    thumb_img = thumb_img.convert('RGB' if thumb_img.mode == 'P' else 'L')
+                thumb_img.thumbnail(THUMBNAIL_SIZE, resample=resample, reducing_gap=2.0)
+        except Exception:
+            return None
+    if thumb_img.mode not in ('RGB', 'L'):
+        thumb_img = thumb_img.convert('RGB')
+
+    if cache_path is not None:
+        try:
+            os.makedirs(THUMBNAIL_CACHE_DIR, exist_ok=True)
+            thumb_img.save(cache_path, THUMBNAIL_CACHE_FORMAT, **THUMBNAIL_CACHE_SAVE_OPTIONS)
+        except OSError:
+            pass
+    return thumb_img
+
+
+def _vips_thumbnail(image_path, size):
+    """使用 libvips 的 shrink-on-load 生成缩略图并转换为 PIL 图像。"""
+    vips_img = pyvips.Image.thumbnail(image_path, size[0], height=size[1], size='down')
+    if vips_img.interpretation not in ('srgb', 'b-w') or vips_img.format != 'uchar':
+        vips_img = vips_img.colourspace('srgb').cast('uchar')
+    mode = {1: 'L', 2: 'LA', 3: 'RGB', 4: 'RGBA'}.get(vips_img.bands)
+    if mode is None:
+        raise ValueError(f"不支持的通道数: {vips_img.bands}")
+    return Image.frombytes(mode, (vips_img.width, vips_img.height), vips_img.write_to_memory())
+
+
+def _scan_cache_path(folder):
+    """返回文件夹扫描结果的缓存文件路径。"""
+    key = hashlib.blake2b(folder.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    return os.path.join(SCAN_CACHE_DIR, f"{key}.json")
+
+
+def _load_scan_cache(folder, supported_formats):
+    """读取扫描缓存；记录的每个目录修改时间都未变化时返回 (路径列表, 文件名列表)，否则返回 None。"""
+    cache_path = _scan_cache_path(folder)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if (data.get('version') != SCAN_CACHE_VERSION or data.get('folder') != folder
+                or data.get('formats') != sorted(supported_formats)):
+            return None
+        # 目录内增删、改名文件或子目录都会更新该目录的 mtime，逐个比对即可判断树是否变化
+        for dir_path, mtime_ns in data['dirs']:
+            if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                return None
+        paths, names = data['paths'], data['names']
+        os.utime(cache_path)  # 刷新修改时间，淘汰时按最近使用排序
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return paths, names
+
+
+def _save_scan_cache(folder, supported_formats, dir_mtimes, image_paths, image_names):
+    """写入扫描缓存（先写临时文件再替换），并只保留最近使用的若干个文件夹。"""
+    if any(mtime_ns is None for _, mtime_ns in dir_mtimes):
+        return  # 有目录读取失败，结果不完整，不写缓存
+    data = {
+        'version': SCAN_CACHE_VERSION,
+        'folder': folder,
+        'formats': sorted(supported_formats),
+        'dirs': dir_mtimes,
+        'paths': image_paths,
+        'names': image_names,
+    }
+    cache_path = _scan_cache_path(folder)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(SCAN_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    try:
+        with os.scandir(SCAN_CACHE_DIR) as it:
+            entries = [entry for entry in it if entry.name.endswith('.json')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[SCAN_CACHE_MAX_FILES:]:
+            os.remove(entry.path)
+    except OSError:
+        pass
+
+
+def _prune_thumbnail_cache(max_files=THUMBNAIL_CACHE_MAX_FILES):
+    """按修改时间删除最久未使用的缓存缩略图，使缓存文件数不超过上限。"""
+    try:
+        with os.scandir(THUMBNAIL_CACHE_DIR) as it:
+            entries = [entry for entry in it if entry.is_file()]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:len(entries) - max_files]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class _PriorityThreadPool:
+    """按优先级调度的固定大小线程池：数值越小越先执行，同优先级按提交顺序执行。"""
+
+    def __init__(self, max_workers, thread_name_prefix='worker'):
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads = []
+        for i in range(max_workers):
+            thread = threading.Thread(target=self._worker, name=f'{thread_name_prefix}_{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, priority, fn, *args):
+        """提交任务并返回 concurrent.futures.Future，尚未开始的任务可通过 cancel() 取消。"""
+        future = concurrent.futures.Future()
+        self._queue.put((priority, next(self._sequence), future, fn, args))
+        return future
+
+    def shutdown(self):
+        """通知所有工作线程退出，排在后面的任务不再执行。"""
+        for _ in self._threads:
+            self._queue.put((float('-inf'), next(self._sequence), None, None, ()))
+
+    def _worker(self):
+        while True:
+            _, _, future, fn, args = self._queue.get()
+            if future is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+class _SecondCachedFormatter(logging.Formatter):
+    """同一秒内的日志复用已格式化的时间文本，只补上毫秒部分，减少 strftime 调用。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_time = None  # (整秒, datefmt, 时间文本)
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached = self._cached_time
+        if cached is None or cached[0] != second or cached[1] != datefmt:
+            time_text = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            cached = self._cached_time = (second, datefmt, time_text)
+        if datefmt or not self.default_msec_format:
+            return cached[2]
+        return self.default_msec_format % (cached[2], record.msecs)
+
 
 class TextWidgetLogHandler(logging.Handler):
-    """将日志输出同步到 Tk 文本组件。"""
+    """将日志输出同步到 Tk 文本组件，按固定间隔批量写入以减少界面刷新。"""
+
+    flush_interval_ms = 50
+    max_lines = 5000
 
-    def __init__(self, text_widget):
+    def __init__(self, text_widget, scrollbar=None):
         super().__init__()
         self.text_widget = text_widget
+        self.scrollbar = scrollbar
+        # 记录已注册的 Tcl 命令名，重新挂接时复用，避免每次 configure 都注册新的回调命令
+        self._yscrollcommand = text_widget.cget('yscrollcommand') if scrollbar is not None else ''
+        self._buffer = collections.deque()
+        self._buffer_lock = threading.Lock()
+        self._flush_pending = False
 
     def emit(self, record):
         message = self.format(record)
-        self.text_widget.after(0, self._append, message)
-
-    def _append(self, message):
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert('end', message + '\n')
+        with self._buffer_lock:
+            self._buffer.append(message)
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        self.text_widget.after(self.flush_interval_ms, self._flush)
+
+    def _flush(self):
+        # 持锁期间只交换缓冲区，拼接字符串放到锁外，减少与工作线程 emit() 的争用
+        with self._buffer_lock:
+            pending, self._buffer = self._buffer, collections.deque()
+            self._flush_pending = False
+        chunk = "\n".join(pending) + "\n"
+        if self.scrollbar is not None:
+            # 批量写入期间断开滚动条回调，结束后只同步一次
+            self.text_widget.configure(yscrollcommand='')
+        self.text_widget.insert('end', chunk)
+        # 只保留最近 max_lines 行，避免长时间运行后文本组件越来越慢
+        last_line = int(self.text_widget.index('end-1c').split('.')[0])
+        if last_line > self.max_lines:
+            self.text_widget.delete('1.0', f'{last_line - self.max_lines}.0')
         self.text_widget.see('end')
-        self.text_widget.configure(state='disabled')
+        if self.scrollbar is not None:
+            self.text_widget.configure(yscrollcommand=self._yscrollcommand)
+            self.scrollbar.set(*self.text_widget.yview())
+
+
+READONLY_TEXT_BINDTAG = 'ReadonlyText'
+_LOG_NAVIGATION_KEYS = frozenset({'Left', 'Right', 'Up', 'Down', 'Home', 'End', 'Prior', 'Next'})
+
+
+def _block_log_edit(event):
+    """日志区只读：放行复制、全选与光标移动，拦截其余按键输入。"""
+    if event.keysym in _LOG_NAVIGATION_KEYS:
+        return None
+    if event.state & 0x4 and event.keysym.lower() in ('c', 'a'):
+        return None
+    return 'break'
+
+
+def _start_config_loader(config_path):
+    """在后台线程读取配置文件，返回 (线程, 结果字典)。"""
+    result = {}
+
+    def worker():
+        try:
+            result['parser'] = read_config_file(config_path)
+        except Exception as exc:  # 交由主线程在 join 后重新抛出
+            result['error'] = exc
+
+    thread = threading.Thread(target=worker, name='config-loader', daemon=True)
+    thread.start()
+    return thread, result
 
 
 class AutoComicRefinerApp(tk.Tk):
     def __init__(self):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        config_path = os.path.join(script_dir, CONFIG_FILENAME)
+        # 配置文件读取与 Tk 解释器初始化并行进行
+        config_loader, config_result = _start_config_loader(config_path)
         super().__init__()
         self.title("AutoComicRefiner 图形界面")
         self.geometry("1380x820")
         self.minsize(1180, 680)
-        self._script_dir = os.path.dirname(os.path.abspath(__file__))
-        self._config_path = os.path.join(self._script_dir, CONFIG_FILENAME)
-        self.config_parser = read_config_file(self._config_path)
+        self._script_dir = script_dir
+        self._config_path = config_path
         self._last_custom_dimensions = {}
-        self._preview_supported_formats = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp', '.gif')
+        # 约定元素均为带点的小写扩展名，扫描时只需小写文件名一侧
+        self._preview_supported_formats = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp', '.gif'})
         self._preview_request_id = 0
+        self._preview_id_counter = itertools.count(1)  # 单调递增的请求编号，不受系统时钟调整影响
         self._preview_image_tk = None
+        self._preview_photo_mode = None
+        self._preview_rendered_source = None
         self._preview_job = None
+        self._preview_job_folder = None
+        self._preview_cancel = threading.Event()
+        self._preview_queue = queue.Queue(maxsize=1)
         self._preview_image_paths = []
+        self._preview_basenames = []
         self._preview_current_index = None
+        self._preview_target_index = None
+        self._preview_nav_pending = None
+        self._preview_nav_job = None
         self._preview_folder = ''
-        self._thumbnail_photo_images = []
-        self._thumbnail_buttons = []
-        self._thumbnail_default_bg = None
-        self._thumbnail_default_active_bg = None
+        self._thumbnail_photo_images = collections.OrderedDict()
+        self._thumbnail_items = []
+        self._thumbnail_requested = set()
+        self._thumbnail_visible_job = None
+        self._thumbnail_highlighted_index = None
         self._current_preview_load_token = None
         self._current_preview_image_pil = None
         self._current_preview_resample = RESAMPLE_LANCZOS
         self._current_preview_info_text = ""
         self._preview_resize_job = None
+        self._preview_cache = collections.OrderedDict()
+        self._current_preview_cache_key = None
+        # 主预览、预取与缩略图共用一个按优先级调度的解码线程池（Pillow 解码期间会释放 GIL）
+        self._decode_pool = _PriorityThreadPool(min(8, os.cpu_count() or 4), thread_name_prefix='decode')
+        self._preview_future = None
+        self._start_preview_worker()
+        config_loader.join()
+        if 'error' in config_result:
+            raise config_result['error']
+        self.config_parser = config_result['parser']
         self._create_variables()
         self._build_ui()
         self._load_config_to_fields()
         self.processing_thread = None
-        self.log_handler = TextWidgetLogHandler(self.log_text)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        self.log_handler = TextWidgetLogHandler(self.log_text, self._log_scrollbar)
+        formatter = _SecondCachedFormatter('%(asctime)s - %(levelname)s - %(message)s')
         self.log_handler.setFormatter(formatter)
         self._update_resize_description()
         self._apply_dimension_mode(self.target_height_mode_var, self.target_height_entry, self.target_height_var, 'target_height')
@@ -81,30 +539,32 @@ class AutoComicRefinerApp(tk.Tk):
         self._sync_split_controls_state()
         self.bind('<Left>', lambda event: self._navigate_preview(-1))
         self.bind('<Right>', lambda event: self._navigate_preview(1))
+        self.protocol('WM_DELETE_WINDOW', self._on_close)
 
     def _create_variables(self):
         self.input_folder_var = tk.StringVar()
-        settings = self.config_parser['Settings']
-        filenames = self.config_parser['Filenames']
+        # 一次性快照为普通字典，避免每个字段都经过 SectionProxy 的插值查找
+        settings = dict(self.config_parser['Settings'])
+        filenames = dict(self.config_parser['Filenames'])
         self.input_folder_var.trace_add('write', self._on_input_folder_change)
-        self.dry_run_var = tk.BooleanVar(value=settings.getboolean('dry_run'))
-        self.log_filename_var = tk.StringVar(value=settings.get('log_filename'))
-        self.num_processes_var = tk.StringVar(value=settings.get('num_processes'))
-        self.resize_mode_var = tk.StringVar(value=settings.get('resize_mode'))
-        self.target_height_var = tk.StringVar(value=settings.get('target_height'))
-        self.target_width_var = tk.StringVar(value=settings.get('target_width'))
-        self.target_height_mode_var = tk.StringVar(value='自定义' if int(settings.get('target_height') or '0') > 0 else '不做处理')
-        self.target_width_mode_var = tk.StringVar(value='自定义' if int(settings.get('target_width') or '0') > 0 else '不做处理')
-        self.max_height_var = tk.StringVar(value=settings.get('max_height'))
-        self.max_width_var = tk.StringVar(value=settings.get('max_width'))
-        self.output_format_var = tk.StringVar(value=settings.get('output_format_for_others'))
-        self.jpeg_quality_var = tk.StringVar(value=settings.get('jpeg_quality'))
-        self.enable_split_var = tk.BooleanVar(value=settings.getboolean('enable_double_page_split'))
-        self.split_left_to_right_var = tk.BooleanVar(value=settings.getboolean('split_order_is_left_to_right'))
-        self.overwrite_existing_var = tk.BooleanVar(value=settings.getboolean('overwrite_existing_output_folders'))
-        self.template_single_var = tk.StringVar(value=filenames.get('template_single'))
-        self.template_split1_var = tk.StringVar(value=filenames.get('template_split_page1'))
-        self.template_split2_var = tk.StringVar(value=filenames.get('template_split_page2'))
+        self.dry_run_var = tk.BooleanVar(value=_parse_bool(settings['dry_run']))
+        self.log_filename_var = tk.StringVar(value=settings['log_filename'])
+        self.num_processes_var = tk.StringVar(value=settings['num_processes'])
+        self.resize_mode_var = tk.StringVar(value=settings['resize_mode'])
+        self.target_height_var = tk.StringVar(value=settings['target_height'])
+        self.target_width_var = tk.StringVar(value=settings['target_width'])
+        self.target_height_mode_var = tk.StringVar(value='自定义' if int(settings['target_height'] or '0') > 0 else '不做处理')
+        self.target_width_mode_var = tk.StringVar(value='自定义' if int(settings['target_width'] or '0') > 0 else '不做处理')
+        self.max_height_var = tk.StringVar(value=settings['max_height'])
+        self.max_width_var = tk.StringVar(value=settings['max_width'])
+        self.output_format_var = tk.StringVar(value=settings['output_format_for_others'])
+        self.jpeg_quality_var = tk.StringVar(value=settings['jpeg_quality'])
+        self.enable_split_var = tk.BooleanVar(value=_parse_bool(settings['enable_double_page_split']))
+        self.split_left_to_right_var = tk.BooleanVar(value=_parse_bool(settings['split_order_is_left_to_right']))
+        self.overwrite_existing_var = tk.BooleanVar(value=_parse_bool(settings['overwrite_existing_output_folders']))
+        self.template_single_var = tk.StringVar(value=filenames['template_single'])
+        self.template_split1_var = tk.StringVar(value=filenames['template_split_page1'])
+        self.template_split2_var = tk.StringVar(value=filenames['template_split_page2'])
         self._last_custom_dimensions['target_height'] = self.target_height_var.get()
         self._last_custom_dimensions['target_width'] = self.target_width_var.get()
 
@@ -143,7 +603,7 @@ class AutoComicRefinerApp(tk.Tk):
         resize_combo = ttk.Combobox(settings_labelframe, textvariable=self.resize_mode_var,
                                      values=('fixed_height', 'fixed_width', 'fit_bounds', 'none'), state='readonly')
         resize_combo.grid(row=0, column=1, sticky="ew", padx=(0, 10))
-        resize_combo.bind('<<ComboboxSelected>>', self._update_resize_description)
+        resize_combo.bind('<<ComboboxSelected>>', self._update_resize_description, add='+')
 
         self.resize_mode_descriptions = {
             'fixed_height': '固定目标高度，宽度按比例缩放，适用于统一高度的竖排页面。',
@@ -178,7 +638,8 @@ class AutoComicRefinerApp(tk.Tk):
         )
         self.target_height_mode_combo.grid(row=0, column=1, padx=(8, 0))
         self.target_height_mode_combo.bind('<<ComboboxSelected>>',
-                                           lambda _event: self._apply_dimension_mode(self.target_height_mode_var, self.target_height_entry, self.target_height_var, 'target_height'))
+                                           lambda _event: self._apply_dimension_mode(self.target_height_mode_var, self.target_height_entry, self.target_height_var, 'target_height'),
+                                           add='+')
 
         ttk.Label(settings_labelframe, text="目标宽度").grid(row=2, column=2, sticky="w", pady=(6, 0))
         target_width_frame = ttk.Frame(settings_labelframe)
@@ -195,7 +656,8 @@ class AutoComicRefinerApp(tk.Tk):
         )
         self.target_width_mode_combo.grid(row=0, column=1, padx=(8, 0))
         self.target_width_mode_combo.bind('<<ComboboxSelected>>',
-                                          lambda _event: self._apply_dimension_mode(self.target_width_mode_var, self.target_width_entry, self.target_width_var, 'target_width'))
+                                          lambda _event: self._apply_dimension_mode(self.target_width_mode_var, self.target_width_entry, self.target_width_var, 'target_width'),
+                                          add='+')
 
         ttk.Label(settings_labelframe, text="最大高度").grid(row=3, column=0, sticky="w", pady=(6, 0))
         ttk.Entry(settings_labelframe, textvariable=self.max_height_var).grid(row=3, column=1, sticky="ew", pady=(6, 0))
@@ -289,24 +751,29 @@ class AutoComicRefinerApp(tk.Tk):
         self.thumbnail_canvas.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(12, 0))
         self.thumbnail_scrollbar = ttk.Scrollbar(preview_frame, orient='horizontal', command=self.thumbnail_canvas.xview)
         self.thumbnail_scrollbar.grid(row=3, column=0, columnspan=2, sticky="ew")
-        self.thumbnail_canvas.configure(xscrollcommand=self.thumbnail_scrollbar.set)
-        self.thumbnail_inner_frame = ttk.Frame(self.thumbnail_canvas)
-        self.thumbnail_canvas_window = self.thumbnail_canvas.create_window((0, 0), window=self.thumbnail_inner_frame, anchor='nw')
-        self.thumbnail_inner_frame.bind(
-            '<Configure>',
-            lambda _event: self.thumbnail_canvas.configure(scrollregion=self.thumbnail_canvas.bbox('all')),
-        )
+        self.thumbnail_canvas.configure(xscrollcommand=self._on_thumbnail_xscroll)
+        self.thumbnail_canvas.bind('<Button-1>', self._on_thumbnail_click)
+        # 选中框只有一个，切换选中时移动它即可
+        self._thumbnail_highlight_item = self.thumbnail_canvas.create_rectangle(
+            0, 0, 0, 0, outline='#3b7ddd', width=2, fill='#dbe9ff', state='hidden')
 
         # 日志输出
         log_frame = ttk.LabelFrame(right_frame, text="运行日志", padding=10)
         log_frame.grid(row=1, column=0, sticky="nsew", pady=(18, 0))
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
-        self.log_text = tk.Text(log_frame, wrap='word', state='disabled', height=12)
+        # 保持 normal 状态以免每次写日志都切换 state，改由按键绑定拦截用户编辑
+        self.log_text = tk.Text(log_frame, wrap='word', height=12)
+        # 只读行为放在排在最前的独立 bindtag 中，Text 类自带的选择、复制绑定保持不变
+        self.log_text.bind_class(READONLY_TEXT_BINDTAG, '<Key>', _block_log_edit)
+        for sequence in ('<<Paste>>', '<<Cut>>', '<<Clear>>', '<<PasteSelection>>'):
+            self.log_text.bind_class(READONLY_TEXT_BINDTAG, sequence, lambda event: 'break')
+        self.log_text.bindtags((READONLY_TEXT_BINDTAG,) + self.log_text.bindtags())
         self.log_text.grid(row=0, column=0, sticky="nsew")
         scrollbar = ttk.Scrollbar(log_frame, orient='vertical', command=self.log_text.yview)
         scrollbar.grid(row=0, column=1, sticky="ns")
         self.log_text.configure(yscrollcommand=scrollbar.set)
+        self._log_scrollbar = scrollbar
 
     def _select_input_folder(self):
         selected = filedialog.askdirectory(title="选择漫画根目录")
@@ -319,22 +786,36 @@ class AutoComicRefinerApp(tk.Tk):
         pass
 
     def _clear_log(self):
-        self.log_text.configure(state='normal')
         self.log_text.delete('1.0', 'end')
-        self.log_text.configure(state='disabled')
 
-    def _on_input_folder_change(self, *_args):
+    def _cancel_pending_preview_job(self):
         if self._preview_job is not None:
             try:
                 self.after_cancel(self._preview_job)
-            except Exception:
+            except tk.TclError:
                 pass
             self._preview_job = None
+            self._preview_job_folder = None
+
+    def _on_input_folder_change(self, *_args):
         folder = self.input_folder_var.get().strip()
+        # 路径未变化（已排队或已在预览）时不重复调度
+        if self._preview_job is not None and folder == self._preview_job_folder:
+            return
+        self._cancel_pending_preview_job()
         if not folder:
             self._set_preview_message("请选择目录以查看预览。")
             return
-        self._preview_job = self.after(600, lambda: self._load_preview_for_folder(folder))
+        if folder == self._preview_folder:
+            return
+        self._preview_job_folder = folder
+        self._preview_job = self.after(600, self._run_scheduled_preview_job)
+
+    def _run_scheduled_preview_job(self):
+        folder = self._preview_job_folder
+        self._preview_job = None
+        self._preview_job_folder = None
+        self._load_preview_for_folder(folder)
 
     def _apply_dimension_mode(self, mode_var, entry_widget, value_var, key):
         mode = mode_var.get()
@@ -381,49 +862,59 @@ class AutoComicRefinerApp(tk.Tk):
         if self.target_width_mode_var.get() == '不做处理':
             self.target_width_var.set('0')
 
-        int_fields = {
-            'target_height': self.target_height_var,
-            'target_width': self.target_width_var,
-            'max_height': self.max_height_var,
-            'max_width': self.max_width_var,
-            'jpeg_quality': self.jpeg_quality_var,
-        }
-        for field_name, var in int_fields.items():
-            value = var.get().strip()
-            if not value:
-                value = '0'
+        # (字段名, 变量, 取值范围及错误提示)；范围为 None 表示只要求整数
+        int_specs = (
+            ('target_height', self.target_height_var, None),
+            ('target_width', self.target_width_var, None),
+            ('max_height', self.max_height_var, None),
+            ('max_width', self.max_width_var, None),
+            ('jpeg_quality', self.jpeg_quality_var, (1, 100, "JPEG 质量必须在 1-100 之间。")),
+        )
+        # 先在本地字典中完成全部校验，全部通过后再一次性写回，避免校验失败时配置只更新了一半
+        pending = {}
+        for field_name, var, bounds in int_specs:
+            value = var.get().strip() or '0'
             try:
                 numeric_value = int(value)
             except ValueError:
                 messagebox.showerror("无效的输入", f"字段 {field_name} 需要整数。")
                 return False
-            if field_name == 'jpeg_quality' and not (1 <= numeric_value <= 100):
-                messagebox.showerror("无效的输入", "JPEG 质量必须在 1-100 之间。")
+            if bounds is not None and not (bounds[0] <= numeric_value <= bounds[1]):
+                messagebox.showerror("无效的输入", bounds[2])
                 return False
-            self.config_parser['Settings'][field_name] = value
-
-        self.config_parser['Settings']['num_processes'] = str(num_processes)
-        self.config_parser['Settings']['resize_mode'] = self.resize_mode_var.get()
-        self.config_parser['Settings']['dry_run'] = 'true' if self.dry_run_var.get() else 'false'
-        self.config_parser['Settings']['output_format_for_others'] = self.output_format_var.get()
-        self.config_parser['Settings']['enable_double_page_split'] = 'true' if self.enable_split_var.get() else 'false'
-        self.config_parser['Settings']['split_order_is_left_to_right'] = 'true' if self.split_left_to_right_var.get() else 'false'
-        self.config_parser['Settings']['overwrite_existing_output_folders'] = 'true' if self.overwrite_existing_var.get() else 'false'
-
-        log_filename = self.log_filename_var.get().strip() or self.config_parser['Settings']['log_filename']
-        self.config_parser['Settings']['log_filename'] = log_filename
-
-        self.config_parser['Filenames']['template_single'] = self.template_single_var.get().strip() or '{base}{ext}'
-        self.config_parser['Filenames']['template_split_page1'] = self.template_split1_var.get().strip() or '{base}_p1{ext}'
-        self.config_parser['Filenames']['template_split_page2'] = self.template_split2_var.get().strip() or '{base}_p2{ext}'
+            pending[field_name] = value
+
+        bool_specs = (
+            ('dry_run', self.dry_run_var),
+            ('enable_double_page_split', self.enable_split_var),
+            ('split_order_is_left_to_right', self.split_left_to_right_var),
+            ('overwrite_existing_output_folders', self.overwrite_existing_var),
+        )
+        for field_name, var in bool_specs:
+            pending[field_name] = 'true' if var.get() else 'false'
+
+        settings = self.config_parser['Settings']
+        pending['num_processes'] = str(num_processes)
+        pending['resize_mode'] = self.resize_mode_var.get()
+        pending['output_format_for_others'] = self.output_format_var.get()
+        pending['log_filename'] = self.log_filename_var.get().strip() or settings['log_filename']
+        settings.update(pending)
+
+        self.config_parser['Filenames'].update({
+            'template_single': self.template_single_var.get().strip() or '{base}{ext}',
+            'template_split_page1': self.template_split1_var.get().strip() or '{base}_p1{ext}',
+            'template_split_page2': self.template_split2_var.get().strip() or '{base}_p2{ext}',
+        })
         return True
 
     def _save_config(self):
         if not self._update_parser_from_fields():
             return
         try:
-            save_config_parser(self.config_parser, self._config_path)
-            messagebox.showinfo("配置已保存", f"已写入 {self._config_path}")
+            if save_config_parser(self.config_parser, self._config_path):
+                messagebox.showinfo("配置已保存", f"已写入 {self._config_path}")
+            else:
+                messagebox.showinfo("配置未变", "无需写入。")
         except OSError as exc:
             messagebox.showerror("保存失败", f"无法写入配置文件: {exc}")
 
@@ -470,6 +961,7 @@ class AutoComicRefinerApp(tk.Tk):
             'no_images': "未找到图片",
             'nothing_to_do': "无需处理",
             'failed': "执行失败",
+            'interrupted': "已中断",
         }
         status = status_map.get(summary.get('status', 'completed'), summary.get('status', 'completed'))
         details = [
@@ -479,6 +971,10 @@ class AutoComicRefinerApp(tk.Tk):
             f"切割页数: {summary.get('total_split', 0)}",
             f"跳过 (缓存): {summary.get('skipped_due_to_cache', 0)}",
             f"错误数: {summary.get('total_errors', 0)}",
+        ]
+        if summary.get('total_cancelled'):
+            details.append(f"已取消: {summary['total_cancelled']}")
+        details += [
             f"日志文件: {summary.get('log_file_path', '未知')}",
         ]
         messagebox.showinfo("处理结果", "\n".join(details))
@@ -491,18 +987,32 @@ class AutoComicRefinerApp(tk.Tk):
         desc = self.resize_mode_descriptions.get(self.resize_mode_var.get(), '')
         self.resize_description_label.configure(text=desc)
 
+    def _release_photo_images(self, photos):
+        """立即删除 Tk 端的图像数据，不必等待 Python 端引用全部释放。"""
+        for photo in photos:
+            if photo is None:
+                continue
+            try:
+                self.tk.call('image', 'delete', str(photo))
+            except tk.TclError:
+                pass
+
     def _set_preview_message(self, message):
-        self._preview_image_tk = None
         self.preview_image_label.configure(image='', text="暂无预览")
+        self._release_photo_images((self._preview_image_tk,))
+        self._preview_image_tk = None
         self.preview_info_var.set(message)
         self.preview_index_var.set(message)
         self._preview_image_paths = []
+        self._preview_basenames = []
         self._preview_current_index = None
+        self._preview_target_index = None
+        self._preview_nav_pending = None
         self._preview_folder = ''
-        self._thumbnail_photo_images = []
-        self._thumbnail_buttons = []
-        self._thumbnail_default_bg = None
-        self._thumbnail_default_active_bg = None
+        self._release_photo_images(self._thumbnail_photo_images.values())
+        self._thumbnail_photo_images = collections.OrderedDict()
+        self._thumbnail_items = []
+        self._thumbnail_requested = set()
         self._current_preview_image_pil = None
         self._current_preview_info_text = ""
         if self._preview_resize_job is not None:
@@ -511,103 +1021,166 @@ class AutoComicRefinerApp(tk.Tk):
             except ValueError:
                 pass
             self._preview_resize_job = None
-        for child in self.thumbnail_inner_frame.winfo_children():
-            child.destroy()
+        self.thumbnail_canvas.delete('thumbnail')
+        self.thumbnail_canvas.itemconfigure(self._thumbnail_highlight_item, state='hidden')
+        self._thumbnail_highlighted_index = None
         self.thumbnail_canvas.configure(scrollregion=(0, 0, 0, 0))
         self._update_navigation_controls()
 
+    def _start_preview_worker(self):
+        """启动常驻的目录扫描线程，同一时间最多只处理一个扫描请求。"""
+        self._preview_worker = threading.Thread(target=self._preview_worker_loop, daemon=True)
+        self._preview_worker.start()
+
+    def _preview_worker_loop(self):
+        while True:
+            folder, request_id = self._preview_queue.get()
+            if folder is None:
+                return
+            self._preview_cancel.clear()
+            scan_result = _load_scan_cache(folder, self._preview_supported_formats)
+            if scan_result is None:
+                dir_mtimes = []
+                scan_result = self._find_all_images(folder, dir_mtimes)
+                if scan_result is not None:
+                    _save_scan_cache(folder, self._preview_supported_formats, dir_mtimes, *scan_result)
+            if scan_result is None or self._preview_request_id != request_id:
+                continue
+            image_paths, image_names = scan_result
+            if not image_paths:
+                self.after(0, lambda: self._set_preview_message("未找到可预览的图片文件。"))
+                continue
+            self.after(0, self._apply_preview_image_list, folder, image_paths, image_names, request_id)
+
+    def _submit_preview_job(self, folder, request_id):
+        """通知正在进行的扫描提前退出，并用最新请求替换尚未开始的请求。"""
+        self._preview_cancel.set()
+        try:
+            self._preview_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._preview_queue.put_nowait((folder, request_id))
+
+    def _on_close(self):
+        self._submit_preview_job(None, 0)
+        # 作废当前请求号与加载令牌，让正在执行的解码任务尽早返回
+        self._preview_request_id = -1
+        self._current_preview_load_token = None
+        self._decode_pool.shutdown()
+        self.destroy()
+
     def _load_preview_for_folder(self, folder):
+        self._cancel_pending_preview_job()
         if not folder or not os.path.isdir(folder):
             self._set_preview_message("目录不存在或不可访问。")
             return
 
-        request_id = time.time()
+        request_id = next(self._preview_id_counter)
         self._preview_request_id = request_id
         self._set_preview_message("正在扫描目录…")
 
-        def worker():
-            image_paths = self._find_all_images(folder)
-            if self._preview_request_id != request_id:
-                return
-            if not image_paths:
-                self.after(0, lambda: self._set_preview_message("未找到可预览的图片文件。"))
-                return
-            self.after(0, lambda: self._apply_preview_image_list(folder, image_paths, request_id))
-
-        threading.Thread(target=worker, daemon=True).start()
+        self._submit_preview_job(folder, request_id)
 
-    def _apply_preview_image_list(self, folder, image_paths, request_id):
+    def _apply_preview_image_list(self, folder, image_paths, image_names, request_id):
         if self._preview_request_id != request_id:
             return
         self._preview_folder = folder
         self._preview_image_paths = image_paths
+        self._preview_basenames = image_names
         self._preview_current_index = 0
+        self._preview_target_index = None
+        self._preview_nav_pending = None
         self.preview_index_var.set(f"1 / {len(image_paths)}")
-        for child in self.thumbnail_inner_frame.winfo_children():
-            child.destroy()
-        self._thumbnail_photo_images = [None] * len(image_paths)
-        self._thumbnail_buttons = []
-        self._thumbnail_default_bg = None
-        self._thumbnail_default_active_bg = None
-        for idx, path in enumerate(image_paths):
-            btn = tk.Button(
-                self.thumbnail_inner_frame,
-                text=os.path.basename(path),
-                width=16,
-                height=6,
-                wraplength=120,
-                justify='center',
-                command=lambda i=idx: self._on_thumbnail_selected(i),
-            )
-            btn.grid(row=0, column=idx, padx=4, pady=4, sticky='n')
-            btn.configure(compound='top')
-            if self._thumbnail_default_bg is None:
-                self._thumbnail_default_bg = btn.cget('bg')
-                self._thumbnail_default_active_bg = btn.cget('activebackground')
-            self._thumbnail_buttons.append(btn)
-        self.thumbnail_inner_frame.update_idletasks()
+        canvas = self.thumbnail_canvas
+        canvas.delete('thumbnail')
+        self._release_photo_images(self._thumbnail_photo_images.values())
+        self._thumbnail_photo_images = collections.OrderedDict()
+        self._thumbnail_items = []
+        self._thumbnail_highlighted_index = None
+        thumb_width, thumb_height = THUMBNAIL_SIZE
+        center_y = THUMBNAIL_TOP + thumb_height // 2
+        for idx, name in enumerate(image_names):
+            center_x = idx * THUMBNAIL_STRIDE + THUMBNAIL_GAP // 2 + thumb_width // 2
+            # 缩略图加载前（或加载失败时）显示文件名占位
+            text_item = canvas.create_text(
+                center_x, center_y, text=name, width=thumb_width,
+                justify='center', fill='#555555', tags=('thumbnail',))
+            image_item = canvas.create_image(center_x, center_y, anchor='center', tags=('thumbnail',))
+            self._thumbnail_items.append((image_item, text_item))
+        canvas.configure(scrollregion=(0, 0, len(image_paths) * THUMBNAIL_STRIDE, thumb_height + 2 * THUMBNAIL_TOP))
+        canvas.xview_moveto(0)
         self._update_navigation_controls()
-        self._start_thumbnail_loader(image_paths, request_id)
+        self._start_thumbnail_loader()
         self._load_preview_image(request_id, 0)
 
-    def _start_thumbnail_loader(self, image_paths, request_id):
-        def worker():
-            for idx, path in enumerate(image_paths):
-                if self._preview_request_id != request_id:
-                    return
-                try:
-                    with Image.open(path) as thumb_img:
-                        thumb_img.load()
-                        thumb_copy = thumb_img.copy()
-                except Exception:
-                    thumb_copy = None
-
-                if thumb_copy is not None:
-                    resample = RESAMPLE_LANCZOS
-                    if thumb_copy.mode in ('1', 'P'):
-                        if thumb_copy.mode == 'P':
-                            thumb_copy = thumb_copy.convert('RGB')
-                        else:
-                            thumb_copy = thumb_copy.convert('L')
-                        resample = RESAMPLE_NEAREST
-                    thumb_copy.thumbnail((120, 120), resample=resample)
-                    photo = ImageTk.PhotoImage(thumb_copy)
-                else:
-                    photo = None
-
-                def apply(idx=idx, photo=photo):
-                    if self._preview_request_id != request_id or idx >= len(self._thumbnail_buttons):
-                        return
-                    button = self._thumbnail_buttons[idx]
-                    if photo is not None:
-                        self._thumbnail_photo_images[idx] = photo
-                        button.configure(image=photo)
-                    else:
-                        button.configure(text=os.path.basename(image_paths[idx]))
+    def _start_thumbnail_loader(self):
+        """重置缩略图状态，只为当前可见区域附近的缩略图安排解码。"""
+        self._thumbnail_requested = set()
+        self._decode_pool.submit(DECODE_PRIORITY_HOUSEKEEPING, _prune_thumbnail_cache)
+        self._update_visible_thumbnails()
+
+    def _on_thumbnail_xscroll(self, first, last):
+        self.thumbnail_scrollbar.set(first, last)
+        # 滚动、拖动、尺寸变化都会触发此回调，合并到空闲时统一计算可见范围
+        if self._thumbnail_visible_job is None:
+            self._thumbnail_visible_job = self.after_idle(self._update_visible_thumbnails)
+
+    def _update_visible_thumbnails(self):
+        self._thumbnail_visible_job = None
+        count = len(self._thumbnail_items)
+        if not count:
+            return
+        view_left = self.thumbnail_canvas.canvasx(0)
+        view_right = view_left + self.thumbnail_canvas.winfo_width()
+        first = max(0, int(view_left // THUMBNAIL_STRIDE) - THUMBNAIL_LOOKAHEAD)
+        last = min(count, int(view_right // THUMBNAIL_STRIDE) + 1 + THUMBNAIL_LOOKAHEAD)
+        for idx in range(first, last):
+            if idx in self._thumbnail_photo_images:
+                self._thumbnail_photo_images.move_to_end(idx)
+        pending = [idx for idx in range(first, last) if idx not in self._thumbnail_requested]
+        if pending:
+            self._request_thumbnails(pending, self._preview_request_id)
+
+    def _request_thumbnails(self, indices, request_id):
+        image_paths = self._preview_image_paths
+
+        def decode(path):
+            # 已切换到其他目录的排队任务直接跳过
+            if self._preview_request_id != request_id:
+                return None
+            return _load_thumbnail_image(path, self._lookup_decoded_preview)
 
-                self.after(0, apply)
+        def apply(idx, thumb_img):
+            if self._preview_request_id != request_id or idx >= len(self._thumbnail_items):
+                return
+            if thumb_img is None:
+                return  # 保留文件名占位
+            canvas = self.thumbnail_canvas
+            image_item, text_item = self._thumbnail_items[idx]
+            # PhotoImage 必须在 Tk 主线程中创建
+            photo = ImageTk.PhotoImage(thumb_img)
+            self._thumbnail_photo_images[idx] = photo
+            canvas.itemconfigure(image_item, image=photo)
+            canvas.itemconfigure(text_item, state='hidden')
+            while len(self._thumbnail_photo_images) > THUMBNAIL_MAX_PHOTOS:
+                evicted_idx, _ = self._thumbnail_photo_images.popitem(last=False)
+                evicted_image_item, evicted_text_item = self._thumbnail_items[evicted_idx]
+                canvas.itemconfigure(evicted_image_item, image='')
+                canvas.itemconfigure(evicted_text_item, state='normal')
+                self._thumbnail_requested.discard(evicted_idx)
+
+        def on_done(idx, future):
+            try:
+                thumb_img = future.result()
+            except Exception:  # pragma: no cover - 解码失败时退化为显示文件名
+                thumb_img = None
+            if self._preview_request_id == request_id:
+                self.after(0, apply, idx, thumb_img)
 
-        threading.Thread(target=worker, daemon=True).start()
+        for idx in indices:
+            self._thumbnail_requested.add(idx)
+            future = self._decode_pool.submit(DECODE_PRIORITY_THUMBNAIL, decode, image_paths[idx])
+            future.add_done_callback(functools.partial(on_done, idx))
 
     def _load_preview_image(self, request_id, index):
         if self._preview_request_id != request_id:
@@ -615,48 +1188,161 @@ class AutoComicRefinerApp(tk.Tk):
         if index < 0 or index >= len(self._preview_image_paths):
             return
         image_path = self._preview_image_paths[index]
-        load_token = (request_id, index, time.time())
+        load_token = (request_id, index, next(self._preview_id_counter))
         self._current_preview_load_token = load_token
+        draft_size = self._get_preview_display_size()
+        cache_key = _image_content_key(image_path)
+        entry = self._preview_cache.get(cache_key) if cache_key else None
+        if _preview_entry_covers(entry, draft_size):
+            self._preview_cache.move_to_end(cache_key)
+            self._apply_loaded_preview(load_token, index, cache_key, entry)
+            return
         self.preview_image_label.configure(image='', text="加载中…")
         self.preview_info_var.set("正在加载预览…")
 
+        def apply_info(info_text):
+            if self._current_preview_load_token != load_token:
+                return
+            self._current_preview_info_text = info_text
+            self.preview_info_var.set(info_text)
+
         def worker():
             try:
-                with Image.open(image_path) as img:
-                    img.load()
-                    info_text = self._build_preview_info(self._preview_folder, image_path, img, original_format=img.format)
-                    display_img = img.copy()
+                entry = self._decode_preview_entry(
+                    image_path,
+                    draft_size,
+                    on_info=lambda info_text: self.after(0, apply_info, info_text),
+                    is_stale=lambda: self._current_preview_load_token != load_token,
+                )
             except Exception as exc:  # pragma: no cover - 仅在 GUI 运行时触发
                 self.after(0, lambda exc=exc: self._handle_preview_error(load_token, exc))
                 return
-
-            resample = RESAMPLE_LANCZOS
-            if display_img.mode in ('1', 'P'):
-                if display_img.mode == 'P':
-                    if 'transparency' in display_img.info:
-                        display_img = display_img.convert('RGBA')
-                    else:
-                        display_img = display_img.convert('RGB')
+            if entry is not None:
+                self.after(0, self._apply_loaded_preview, load_token, index, cache_key, entry)
+
+        # 新请求到来时取消尚未开始的旧请求，连续翻页时不会堆积解码任务
+        if self._preview_future is not None and not self._preview_future.done():
+            self._preview_future.cancel()
+        self._preview_future = self._decode_pool.submit(DECODE_PRIORITY_PREVIEW, worker)
+
+    def _decode_preview_entry(self, image_path, draft_size, on_info=None, is_stale=None):
+        """按显示尺寸解码图片并生成预览缓存条目；is_stale() 为真时提前放弃并返回 None。"""
+        with Image.open(image_path) as img:
+            # 阶段一：仅解析文件头即可得到元数据，先行刷新信息面板
+            meta = {
+                'size': img.size,
+                'mode': img.mode,
+                'bands': img.getbands(),
+                'dpi': img.info.get('dpi'),
+                'format': img.format,
+            }
+            info_text = self._build_preview_info(self._preview_folder, image_path, meta)
+            if on_info is not None:
+                on_info(info_text)
+            if is_stale is not None and is_stale():
+                return None  # 已切换到其他页面，跳过像素解码
+            # 阶段二：按显示尺寸解码像素，优先使用 libvips 的 shrink-on-load
+            display_img = None
+            if pyvips is not None:
+                try:
+                    display_img = _vips_thumbnail(image_path, draft_size)
+                except Exception:
+                    display_img = None
+            if display_img is None:
+                # draft() 会改写 size，因此放在读取元数据之后
+                img.draft('RGB', draft_size)
+                img.load()
+                display_img = img  # load() 后像素已与文件句柄分离，无需 copy()
+                # PNG/TIFF 等无 draft 的大图先按整数倍 reduce() 到不小于显示尺寸，
+                # 之后每次渲染只需从小得多的图缩放，缓存占用也随之下降
+                factor = min(img.width // draft_size[0], img.height // draft_size[1])
+                if factor >= 2 and img.mode not in ('1', 'P'):
+                    try:
+                        display_img = img.reduce(factor)
+                    except ValueError:
+                        pass  # 个别模式不支持 reduce()，保留原图
+            full_resolution = display_img.size == meta['size']
+
+        resample = RESAMPLE_LANCZOS
+        if display_img.mode in ('1', 'P'):
+            if display_img.mode == 'P':
+                if 'transparency' in display_img.info:
+                    display_img = display_img.convert('RGBA')
                 else:
-                    display_img = display_img.convert('L')
-                resample = RESAMPLE_NEAREST
+                    display_img = display_img.convert('RGB')
+            else:
+                display_img = display_img.convert('L')
+            resample = RESAMPLE_NEAREST
+
+        return {
+            'image': display_img,
+            'resample': resample,
+            'info_text': info_text,
+            'draft_size': draft_size,
+            'full_resolution': full_resolution,
+        }
+
+    def _prefetch_neighbors(self, index):
+        """在后台预解码相邻页面写入预览缓存，顺序翻页时可直接命中。"""
+        request_id = self._preview_request_id
+        draft_size = self._get_preview_display_size()
+        offsets = (d * sign for d in range(1, PREVIEW_PREFETCH_RADIUS + 1) for sign in (1, -1))
+        for neighbor in (index + offset for offset in offsets):
+            if not 0 <= neighbor < len(self._preview_image_paths):
+                continue
+            image_path = self._preview_image_paths[neighbor]
+            cache_key = _image_content_key(image_path)
+            if cache_key is None or _preview_entry_covers(self._preview_cache.get(cache_key), draft_size):
+                continue
 
-            def apply_preview():
-                if self._current_preview_load_token != load_token:
+            def prefetch(image_path=image_path, cache_key=cache_key):
+                if self._preview_request_id != request_id:
                     return
-                self._current_preview_image_pil = display_img
-                self._current_preview_resample = resample
-                self._current_preview_info_text = info_text
-                self._render_current_preview_image()
-                self.preview_info_var.set(info_text)
-                self._preview_current_index = index
-                self.preview_index_var.set(f"{index + 1} / {len(self._preview_image_paths)}")
-                self._highlight_thumbnail(index)
-                self._update_navigation_controls()
+                try:
+                    entry = self._decode_preview_entry(
+                        image_path, draft_size, is_stale=lambda: self._preview_request_id != request_id)
+                except Exception:
+                    return  # 预取失败不影响界面，真正翻页时会再次加载并报告错误
+                if entry is not None:
+                    self.after(0, self._store_prefetched_entry, request_id, cache_key, entry)
 
-            self.after(0, apply_preview)
+            self._decode_pool.submit(DECODE_PRIORITY_PREFETCH, prefetch)
 
-        threading.Thread(target=worker, daemon=True).start()
+    def _store_prefetched_entry(self, request_id, cache_key, entry):
+        if self._preview_request_id != request_id or cache_key in self._preview_cache:
+            return
+        self._store_preview_cache_entry(cache_key, entry)
+
+    def _apply_loaded_preview(self, load_token, index, cache_key, entry):
+        if self._current_preview_load_token != load_token:
+            return
+        if cache_key is not None and cache_key not in self._preview_cache:
+            self._store_preview_cache_entry(cache_key, entry)
+        self._current_preview_cache_key = cache_key
+        self._current_preview_image_pil = entry['image']
+        self._current_preview_resample = entry['resample']
+        self._current_preview_info_text = entry['info_text']
+        self._render_current_preview_image()
+        self.preview_info_var.set(entry['info_text'])
+        self._preview_current_index = index
+        self.preview_index_var.set(f"{index + 1} / {len(self._preview_image_paths)}")
+        self._highlight_thumbnail(index)
+        self._update_navigation_controls()
+        self._prefetch_neighbors(index)
+
+    def _lookup_decoded_preview(self, cache_key):
+        """供缩略图线程查询：若主预览已解码过该图片则直接返回其 PIL 图像。"""
+        entry = self._preview_cache.get(cache_key)
+        return entry['image'] if entry is not None else None
+
+    def _store_preview_cache_entry(self, cache_key, entry):
+        """写入预览缓存，并按条目数与像素内存总量淘汰最久未用的条目。"""
+        self._preview_cache[cache_key] = entry
+        total_bytes = sum(_pil_image_nbytes(item['image']) for item in self._preview_cache.values())
+        while len(self._preview_cache) > 1 and (
+                len(self._preview_cache) > PREVIEW_CACHE_MAX_ENTRIES or total_bytes > PREVIEW_CACHE_MAX_BYTES):
+            _, evicted = self._preview_cache.popitem(last=False)
+            total_bytes -= _pil_image_nbytes(evicted['image'])
 
     def _handle_preview_error(self, load_token, exc):
         if self._current_preview_load_token != load_token:
@@ -666,41 +1352,72 @@ class AutoComicRefinerApp(tk.Tk):
         self._preview_image_tk = None
         self._current_preview_image_pil = None
 
+    def _navigation_index(self):
+        """返回导航基准页：优先使用尚未显示完成的目标页，使连按方向键能持续前进。"""
+        if self._preview_target_index is not None:
+            return self._preview_target_index
+        return self._preview_current_index if self._preview_current_index is not None else 0
+
     def _navigate_preview(self, step):
         if not self._preview_image_paths:
             return
-        current = self._preview_current_index if self._preview_current_index is not None else 0
-        self._navigate_to_index(current + step)
+        self._navigate_to_index(self._navigation_index() + step)
 
     def _navigate_to_index(self, index):
         if not self._preview_image_paths:
             return
         index = max(0, min(index, len(self._preview_image_paths) - 1))
-        if self._preview_current_index == index and self._preview_image_tk is not None:
+        last_token = self._current_preview_load_token
+        if (self._preview_nav_pending is None and last_token is not None and last_token[1] == index
+                and self._preview_image_tk is not None):
             return
+        self._preview_target_index = index
         self.preview_index_var.set(f"{index + 1} / {len(self._preview_image_paths)}")
         self._highlight_thumbnail(index)
         self._update_navigation_controls()
+        if self._preview_nav_job is not None:
+            # 冷却期内只记录目标页，冷却结束后只加载最后请求的那一页
+            self._preview_nav_pending = index
+            return
         self._load_preview_image(self._preview_request_id, index)
+        self._preview_nav_job = self.after(PREVIEW_NAV_DEBOUNCE_MS, self._flush_preview_navigation)
+
+    def _flush_preview_navigation(self):
+        self._preview_nav_job = None
+        index, self._preview_nav_pending = self._preview_nav_pending, None
+        if index is not None and self._preview_image_paths:
+            self._navigate_to_index(index)
 
     def _on_thumbnail_selected(self, index):
         self._navigate_to_index(index)
 
+    def _on_thumbnail_click(self, event):
+        index = int(self.thumbnail_canvas.canvasx(event.x) // THUMBNAIL_STRIDE)
+        if 0 <= index < len(self._thumbnail_items):
+            self._on_thumbnail_selected(index)
+
     def _highlight_thumbnail(self, index):
-        for idx, button in enumerate(self._thumbnail_buttons):
-            if button is None:
-                continue
-            if idx == index:
-                button.configure(relief='sunken', bg='#dbe9ff', activebackground='#dbe9ff')
-            else:
-                default_bg = self._thumbnail_default_bg or button.cget('bg')
-                default_active = self._thumbnail_default_active_bg or button.cget('activebackground')
-                button.configure(relief='raised', bg=default_bg, activebackground=default_active)
+        # 翻页时会先后以同一序号调用两次（选中目标、加载完成），选中未变则不再发 Tcl 命令
+        if index == self._thumbnail_highlighted_index:
+            return
+        canvas = self.thumbnail_canvas
+        if not 0 <= index < len(self._thumbnail_items):
+            canvas.itemconfigure(self._thumbnail_highlight_item, state='hidden')
+            self._thumbnail_highlighted_index = None
+            return
+        self._thumbnail_highlighted_index = index
+        left = index * THUMBNAIL_STRIDE + THUMBNAIL_GAP // 2
+        canvas.coords(
+            self._thumbnail_highlight_item,
+            left - 4, THUMBNAIL_TOP - 4, left + THUMBNAIL_SIZE[0] + 4, THUMBNAIL_TOP + THUMBNAIL_SIZE[1] + 4,
+        )
+        canvas.itemconfigure(self._thumbnail_highlight_item, state='normal')
+        canvas.tag_lower(self._thumbnail_highlight_item)
 
     def _update_navigation_controls(self):
         has_images = bool(self._preview_image_paths)
         if has_images:
-            current = self._preview_current_index if self._preview_current_index is not None else 0
+            current = self._navigation_index()
             if current <= 0:
                 self.prev_button.state(['disabled'])
             else:
@@ -721,34 +1438,91 @@ class AutoComicRefinerApp(tk.Tk):
                 pass
         self._preview_resize_job = self.after(120, self._render_current_preview_image)
 
-    def _render_current_preview_image(self):
-        self._preview_resize_job = None
-        if self._current_preview_image_pil is None:
-            return
+    def _get_preview_display_size(self):
         max_width = self.preview_image_label.winfo_width()
         max_height = self.preview_image_label.winfo_height()
         if max_width <= 1:
             max_width = self.preview_image_label.winfo_reqwidth() or 600
         if max_height <= 1:
             max_height = self.preview_image_label.winfo_reqheight() or 600
-        display_img = self._current_preview_image_pil.copy()
-        display_img.thumbnail((max_width, max_height), resample=self._current_preview_resample)
-        photo = ImageTk.PhotoImage(display_img)
-        self._preview_image_tk = photo
+        return max_width, max_height
+
+    def _render_current_preview_image(self):
+        self._preview_resize_job = None
+        if self._current_preview_image_pil is None:
+            return
+        max_width, max_height = self._get_preview_display_size()
+        source_img = self._current_preview_image_pil
+        # 直接 resize 出目标尺寸，避免先 copy() 整张原图再 thumbnail()
+        target_size = _fit_size(source_img.size, (max_width, max_height))
+        photo = self._preview_image_tk
+        if photo is not None and self._preview_rendered_source is source_img \
+                and (photo.width(), photo.height()) == target_size:
+            pass  # 同一张图、同一尺寸已绘制过，无需重新缩放与上传像素
+        else:
+            if target_size == source_img.size:
+                display_img = source_img
+            else:
+                display_img = source_img.resize(target_size, self._current_preview_resample, reducing_gap=2.0)
+            photo_mode = display_img.mode if display_img.mode in ('1', 'L', 'RGB', 'RGBA') \
+                else Image.getmodebase(display_img.mode)
+            if photo is not None and (photo.width(), photo.height()) == target_size \
+                    and self._preview_photo_mode == photo_mode:
+                # 尺寸与模式一致时直接把像素写入现有 PhotoImage，省去新建 Tk 图像
+                photo.paste(display_img)
+            else:
+                photo = ImageTk.PhotoImage(display_img)
+                self._preview_image_tk = photo
+                self._preview_photo_mode = photo_mode
+            self._preview_rendered_source = source_img
         self.preview_image_label.configure(image=photo, text="")
         if self._current_preview_info_text:
             self.preview_info_var.set(self._current_preview_info_text)
 
-    def _find_all_images(self, folder):
+    def _find_all_images(self, folder, dir_mtimes=None):
+        """递归收集可预览的图片路径及文件名，返回 (路径列表, 文件名列表)；扫描被新请求取消时返回 None。
+
+        传入 dir_mtimes 列表时，按扫描顺序追加 [目录, st_mtime_ns]（读取失败记为 None），供扫描缓存校验。
+        """
         image_paths = []
-        for root_dir, dirs, files in os.walk(folder):
-            dirs.sort()
-            for filename in sorted(files):
-                if filename.lower().endswith(self._preview_supported_formats):
-                    image_paths.append(os.path.join(root_dir, filename))
-        return image_paths
-
-    def _build_preview_info(self, folder, image_path, image_obj, *, original_format=None):
+        image_names = []  # 直接取自 DirEntry.name，免去之后逐个 basename()
+        supported_formats = self._preview_supported_formats
+        stack = [folder]
+        while stack:
+            if self._preview_cancel.is_set():
+                return None
+            current_dir = stack.pop()
+            try:
+                # 先记录 mtime 再列目录：扫描期间发生的变动会在下次校验时被发现
+                if dir_mtimes is not None:
+                    dir_mtimes.append([current_dir, os.stat(current_dir).st_mtime_ns])
+                with os.scandir(current_dir) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                if dir_mtimes is not None:
+                    dir_mtimes.append([current_dir, None])
+                continue
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    # 只取最后一个扩展名并小写一次，集合查找为 O(1)
+                    _, dot, ext = entry.name.rpartition('.')
+                    if dot and '.' + ext.lower() in supported_formats:
+                        image_paths.append(entry.path)
+                        image_names.append(entry.name)
+            # 逆序入栈，保证与排序后的 os.walk 相同的先序遍历顺序
+            stack.extend(reversed(subdirs))
+        return image_paths, image_names
+
+    def _build_preview_info(self, folder, image_path, meta):
+        """根据文件头元数据（size/mode/bands/dpi/format）生成预览信息文本。"""
         rel_path = os.path.relpath(image_path, folder)
         try:
             file_size = os.path.getsize(image_path)
@@ -756,24 +1530,25 @@ class AutoComicRefinerApp(tk.Tk):
         except OSError:
             size_text = "未知"
 
-        mode = image_obj.mode
-        channels = image_obj.getbands()
+        mode = meta['mode']
+        channels = meta['bands']
         bits_per_channel = self._estimate_bits_per_channel(mode)
         if bits_per_channel:
             depth_text = f"{bits_per_channel}-bit × {len(channels)} 通道"
         else:
             depth_text = f"未知 (模式 {mode})"
 
-        dpi = image_obj.info.get('dpi') if hasattr(image_obj, 'info') else None
+        dpi = meta.get('dpi')
         if dpi and isinstance(dpi, (tuple, list)) and len(dpi) >= 2:
             dpi_text = f"{dpi[0]:.0f} × {dpi[1]:.0f} dpi"
         else:
             dpi_text = "未标注"
 
+        width, height = meta['size']
         info_lines = [
             f"文件: {rel_path}",
-            f"格式: {original_format or os.path.splitext(image_path)[1].lstrip('.').upper()}",
-            f"分辨率: {image_obj.width} × {image_obj.height}",
+            f"格式: {meta.get('format') or os.path.splitext(image_path)[1].lstrip('.').upper()}",
+            f"分辨率: {width} × {height}",
             f"色彩模式: {mode} ({', '.join(channels)})",
             f"色深: {depth_text}",
             f"DPI: {dpi_text}",
@@ -783,23 +1558,7 @@ class AutoComicRefinerApp(tk.Tk):
 
     @staticmethod
     def _estimate_bits_per_channel(mode):
-        mapping = {
-            '1': 1,
-            'L': 8,
-            'P': 8,
-            'RGB': 8,
-            'RGBA': 8,
-            'CMYK': 8,
-            'YCbCr': 8,
-            'I;16': 16,
-            'I;16B': 16,
-            'I;16L': 16,
-            'I;16S': 16,
-            'I;32': 32,
-            'I': 32,
-            'F': 32,
-        }
-        return mapping.get(mode)
+        return _MODE_BITS_PER_CHANNEL.get(mode)
 
 
 def main():
@@ -1,8 +1,18 @@
+import argparse
 import os
-from PIL import Image, UnidentifiedImageError
+from PIL import Image, UnidentifiedImageError, features
 import shutil
 import logging
+import logging.handlers
 import configparser
+import concurrent.futures
+import functools
+import hashlib
+import io
+import json
+import re
+import sqlite3
+import threading
 
 try:
     from tqdm import tqdm  # type: ignore
@@ -35,6 +45,21 @@ except ModuleNotFoundError:  # pragma: no cover - graceful fallback when tqdm is
                 print(f"{self.desc}完成: {self.count}/{self.total}{self.unit}")
 
     tqdm = _SimpleTqdm
+
+try:
+    import cv2  # type: ignore
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - OpenCV 为可选依赖，缺失时使用 Pillow 缩放
+    cv2 = None
+    np = None
+try:
+    import pyvips  # type: ignore
+except (ImportError, OSError):  # pragma: no cover - pyvips/libvips 为可选依赖，缺失时用 Pillow 解码 PNG
+    pyvips = None
+try:
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover - psutil 为可选依赖，缺失时在 POSIX 上改用 sysconf 估算可用内存
+    psutil = None
 import multiprocessing
 import time
 
@@ -64,8 +89,17 @@ DEFAULT_CONFIG = {
 
 # 全局变量存储当前配置，以便保存时使用
 current_config_to_save = configparser.ConfigParser()
+# 已解析配置的缓存: 路径 -> ((mtime, size), ConfigParser)
+_CONFIG_CACHE = {}
 NEW_ROOT_OUTPUT_SUBFOLDER_NAME = "new" # 新的总输出根目录的子文件夹名 (相对于input_folder)
 CONFIG_FILENAME = "config.ini" # 配置文件名
+IMAGE_SIZE_CACHE_FILENAME = ".image_size_cache.json" # 位于 new/ 下，记录源图尺寸供"已处理"判断复用
+OUTPUT_MEMO_FILENAME = ".output_memo.sqlite3" # 位于 new/ 下，按内容键记录输出文件，文件夹改名后可直接复用
+CONTENT_KEY_READ_BYTES = 1024 * 1024 # 计算内容键时每次读取的字节数
+SCAN_THREADS = 16 # 并发读取目录的线程数，同时也是同一时刻打开的目录句柄上限
+WORKER_MEMORY_SAMPLE_COUNT = 16 # 估算单任务内存时抽样读取文件头的图片数
+WORKER_BYTES_PER_SOURCE_PIXEL = 8 # 源图每像素约占：解码图与格式转换/数组副本各一份（按 4 通道计）
+WORKER_BYTES_PER_OUTPUT_PIXEL = 12 # 输出每像素约占：缩放结果、转换副本与切割页各一份（按 4 通道计）
 
 
 def initialize_config_parser():
@@ -279,18 +313,106 @@ def initialize_config_parser():
     return parser
 
 
+def _config_file_signature(config_file_path_abs):
+    """返回配置文件的 (mtime_ns, size)，文件不存在时返回 None。"""
+    try:
+        stat_result = os.stat(config_file_path_abs)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+_INI_SECTION_RE = re.compile(r'\[([^\]]+)\]')
+_INI_KV_RE = re.compile(r'([^=:\s]+)\s*=\s*(.*)')
+
+
+def _parse_ini_fast(text):
+    """用两条正则解析简单的 INI 文本，返回 {节: {键: 值}}；遇到注释、续行等复杂语法时返回 None。"""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line:
+            continue
+        if line[0] in ' \t;#':
+            return None  # 续行或注释交给 configparser 处理
+        match = _INI_SECTION_RE.fullmatch(line)
+        if match:
+            name = match.group(1)
+            if name == configparser.DEFAULTSECT or name in sections:
+                return None
+            current = sections[name] = {}
+            continue
+        match = _INI_KV_RE.fullmatch(line)
+        if match is None or current is None:
+            return None
+        key = match.group(1).lower()  # 与 ConfigParser.optionxform 保持一致
+        if key in current:
+            return None
+        current[key] = match.group(2)
+    return sections
+
+
+def _config_parser_from_dict(sections):
+    """由 {节: {键: 值}} 构建新的 ConfigParser。"""
+    parser = configparser.ConfigParser()
+    parser.read_dict(sections)
+    return parser
+
+
+def _config_parser_snapshot(parser):
+    """将 ConfigParser 转为普通字典快照（保留未插值的原始值）。"""
+    return {section: dict(parser.items(section, raw=True)) for section in parser.sections()}
+
+
 def read_config_file(config_file_path_abs):
-    """读取配置文件并在缺失时应用默认值。"""
-    parser = initialize_config_parser()
-    if os.path.exists(config_file_path_abs):
-        parser.read(config_file_path_abs, encoding='utf-8')
+    """读取配置文件并在缺失时应用默认值，文件未变化时复用缓存的解析结果。"""
+    signature = _config_file_signature(config_file_path_abs)
+    if signature is None:
+        return initialize_config_parser()
+    cached = _CONFIG_CACHE.get(config_file_path_abs)
+    if cached is not None and cached[0] == signature:
+        return _config_parser_from_dict(cached[1])
+    with open(config_file_path_abs, 'r', encoding='utf-8') as config_file:
+        text = config_file.read()
+    file_sections = _parse_ini_fast(text)
+    if file_sections is None:
+        parser = initialize_config_parser()
+        parser.read_string(text, source=config_file_path_abs)
+        snapshot = _config_parser_snapshot(parser)
+    else:
+        # 默认值打底，再用文件中的值覆盖
+        snapshot = {section: dict(options) for section, options in DEFAULT_CONFIG.items()}
+        for section, options in file_sections.items():
+            snapshot.setdefault(section, {}).update(options)
+        parser = _config_parser_from_dict(snapshot)
+    _CONFIG_CACHE[config_file_path_abs] = (signature, snapshot)
     return parser
 
 
 def save_config_parser(parser, config_file_path_abs):
-    """将配置写入指定路径。"""
-    with open(config_file_path_abs, 'w', encoding='utf-8') as configfile:
-        parser.write(configfile)
+    """将配置写入指定路径，并同步更新解析缓存。内容未变化时跳过写入并返回 False。"""
+    buffer = io.StringIO()
+    parser.write(buffer)
+    # 与原先文本模式写入一致使用平台换行符（Windows 上为 CRLF），旧版本写出的未改动配置才能被判定为相同
+    new_bytes = buffer.getvalue().replace('\n', os.linesep).encode('utf-8')
+    try:
+        with open(config_file_path_abs, 'rb') as existing_file:
+            if existing_file.read() == new_bytes:
+                return False
+    except OSError:
+        pass
+    # 先写临时文件再原子替换，避免中途失败留下半截配置
+    tmp_path = config_file_path_abs + '.tmp'
+    with open(tmp_path, 'wb') as configfile:
+        configfile.write(new_bytes)
+        configfile.flush()
+        os.fsync(configfile.fileno())
+    os.replace(tmp_path, config_file_path_abs)
+    signature = _config_file_signature(config_file_path_abs)
+    if signature is not None:
+        _CONFIG_CACHE[config_file_path_abs] = (signature, _config_parser_snapshot(parser))
+    return True
 
 
 def config_parser_to_dict(config_parser, input_folder_root):
@@ -317,19 +439,77 @@ def config_parser_to_dict(config_parser, input_folder_root):
         'template_split_page2': filenames_cfg_proxy.get('template_split_page2')
     }
 
+def _jpeg_codec_is_turbo():
+    """Pillow 链接的 JPEG 库是否为 libjpeg-turbo；无法判断时返回 None。"""
+    try:
+        return bool(features.check_feature('libjpeg_turbo'))
+    except ValueError:  # 旧版 Pillow 不认识该特性名
+        return None
+
+_CUDA_RESIZE_AVAILABLE = None # 每个工作进程首次使用 GPU 缩放时检测一次
+
+def _cuda_resize_available():
+    """OpenCV 是否带 CUDA 支持且有可用显卡；只应在工作进程内调用，避免父进程初始化 CUDA 后再 fork。"""
+    global _CUDA_RESIZE_AVAILABLE
+    if _CUDA_RESIZE_AVAILABLE is None:
+        try:
+            _CUDA_RESIZE_AVAILABLE = cv2 is not None and cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except (AttributeError, cv2.error):
+            _CUDA_RESIZE_AVAILABLE = False
+    return _CUDA_RESIZE_AVAILABLE
+
+def _cuda_resize(arr, new_size, shrinking):
+    """在 GPU 上缩放；CUDA 版 resize 不支持 LANCZOS，放大时改用 INTER_CUBIC。"""
+    gpu_mat = cv2.cuda_GpuMat()
+    gpu_mat.upload(arr)
+    interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_CUBIC
+    return cv2.cuda.resize(gpu_mat, new_size, interpolation=interpolation).download()
+
+def _resize_image(img, new_size, use_gpu=False):
+    """缩放到 new_size；装有 OpenCV 时对 8 位 L/RGB 图使用 cv2.resize（use_gpu 且可用时在 GPU 上执行），否则用 Pillow 的 LANCZOS。"""
+    # RGBA 仍交给 Pillow：它会先预乘 alpha 再重采样，cv2 直接插值会在透明边缘产生色边
+    if cv2 is not None and img.mode in ('L', 'RGB'):
+        shrinking = new_size[0] * new_size[1] < img.width * img.height
+        arr = np.asarray(img)
+        resized_arr = None
+        if use_gpu and _cuda_resize_available():
+            try: resized_arr = _cuda_resize(arr, new_size, shrinking)
+            except cv2.error: resized_arr = None # 显存不足等情况退回 CPU
+        if resized_arr is None:
+            # 缩小用 INTER_AREA（区域平均，无摩尔纹），放大用 INTER_LANCZOS4
+            interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4
+            resized_arr = cv2.resize(arr, new_size, interpolation=interpolation)
+        resized = Image.fromarray(resized_arr)
+        resized.info = img.info.copy()  # 与 Image.resize 一致，保留 ICC 等元数据供保存时使用
+        return resized
+    try: return img.resize(new_size, Image.Resampling.LANCZOS)
+    except AttributeError: return img.resize(new_size, Image.ANTIALIAS)
+
 def get_script_directory():
     """获取当前运行脚本所在的目录"""
     # __file__ 是当前文件的路径。os.path.abspath确保我们得到绝对路径。
     # os.path.dirname获取该路径的目录部分。
     return os.path.dirname(os.path.abspath(__file__))
 
+LOG_FORMAT = '%(asctime)s - %(processName)s - %(levelname)s - %(message)s'
+LOG_FILE_BUFFER_RECORDS = 1000 # 日志文件每累计这么多条才写盘一次；ERROR 及以上立即写出
+
 def setup_logging(log_path, is_dry_run, *, additional_handlers=None, include_console=True):
     """配置日志记录器"""
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
+        if isinstance(handler, logging.handlers.MemoryHandler):
+            # 上一次运行创建的缓冲文件日志：写出剩余记录并关闭文件
+            target = handler.target
+            handler.close()
+            if target is not None: target.close()
 
     log_mode = 'w'
-    handlers = [logging.FileHandler(log_path, mode=log_mode, encoding='utf-8')]
+    file_handler = logging.FileHandler(log_path, mode=log_mode, encoding='utf-8')
+    # basicConfig 只会给外层 MemoryHandler 设置格式，真正写文件的 FileHandler 需自行设置
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    # 成千上万条"已处理"记录按批写入文件，而不是每条一次 write 系统调用
+    handlers = [logging.handlers.MemoryHandler(LOG_FILE_BUFFER_RECORDS, flushLevel=logging.ERROR, target=file_handler)]
     if include_console:
         handlers.append(logging.StreamHandler())
     if additional_handlers:
@@ -337,19 +517,49 @@ def setup_logging(log_path, is_dry_run, *, additional_handlers=None, include_con
 
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s',
+        format=LOG_FORMAT,
         handlers=handlers
     )
 
-def load_or_get_config(config_file_path_abs, input_folder_root_path): # config_file_path_abs 是绝对路径
-    """加载配置，如果不存在或不完整则提示用户并使用默认值"""
+def _find_covering_dir(path, dirs):
+    """返回 dirs（集合或字典）中等于 path 或是其祖先的目录，不存在时返回 None"""
+    while True:
+        if path in dirs: return path
+        parent = os.path.dirname(path)
+        if parent == path: return None
+        path = parent
+
+def _outermost_dirs(dirs):
+    """去掉已被列表中其他祖先目录包含的子目录，保持原有顺序"""
+    dir_set = set(dirs)
+    return [d for d in dirs if _find_covering_dir(os.path.dirname(d), dir_set) is None]
+
+def _remove_trees_parallel(dirs, max_workers):
+    """用线程并行删除互不嵌套的目录树，返回 {目录: 异常}，全部成功时为空字典"""
+    if not dirs: return {}
+    errors = {}
+    def remove_tree(path):
+        try: shutil.rmtree(path)
+        except OSError as e: errors[path] = e
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(dirs)))) as executor:
+        list(executor.map(remove_tree, dirs))
+    return errors
+
+def _flush_log_handlers():
+    for handler in logging.root.handlers:
+        handler.flush()
+
+def load_or_get_config(config_file_path_abs, input_folder_root_path, interactive=True): # config_file_path_abs 是绝对路径
+    """加载配置，如果不存在或不完整则提示用户并使用默认值；interactive=False 时不提示，直接使用配置文件"""
     global current_config_to_save
     current_config_to_save = read_config_file(config_file_path_abs)
 
     if os.path.exists(config_file_path_abs):
         print(f"已从 '{config_file_path_abs}' 加载配置。")
     else:
-        print(f"配置文件 '{config_file_path_abs}' 未找到，将使用默认设置并提示。")
+        print(f"配置文件 '{config_file_path_abs}' 未找到，将使用默认设置" + ("并提示。" if interactive else "。"))
+    if not interactive:
+        return config_parser_to_dict(current_config_to_save, input_folder_root_path)
 
     settings_proxy = current_config_to_save['Settings']
     filenames_cfg_proxy = current_config_to_save['Filenames']
@@ -499,39 +709,144 @@ def get_dynamic_output_format_and_ext(original_ext_lower, config):
     default_format = config['output_format_for_others']
     return default_format.upper(), '.jpg' if default_format == 'jpeg' else '.png'
 
-def get_all_image_files(input_folder, supported_formats, log_filename_val):
-    """收集所有需要处理的图片文件路径, 跳过日志文件, 以及 input_folder/new/ 目录"""
-    all_files_to_process = []
+def _scan_directory(dir_path, skip_filename, supported_exts, skip_dir_abs, want_stat):
+    """读取单个目录，返回 ((st_dev, st_ino), [(图片路径, stat 结果或 None, 符号链接目标或 None)], [子目录路径])；目录不可读时标识为 None"""
+    try:
+        dir_stat = os.stat(dir_path)
+        with os.scandir(dir_path) as it:
+            entries = list(it)
+    except OSError:
+        return None, [], []
+    image_files = []
+    subdirectories = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            # 与 os.walk 默认行为一致：不进入指向目录的符号链接
+            if not entry.is_symlink() and os.path.abspath(entry.path) != skip_dir_abs:
+                subdirectories.append(entry.path)
+            continue
+        filename = entry.name
+        if filename == skip_filename:
+            continue
+        _, dot, ext = filename.rpartition('.')
+        if dot and '.' + ext.lower() in supported_exts:
+            stat_result = None
+            if want_stat:
+                try:
+                    stat_result = entry.stat()
+                except OSError:
+                    pass
+            link_target = os.path.normcase(os.path.realpath(entry.path)) if entry.is_symlink() else None
+            image_files.append((entry.path, stat_result, link_target))
+    return (dir_stat.st_dev, dir_stat.st_ino), image_files, subdirectories
+
+def _drop_duplicate_links(image_files, skip_dir_abs):
+    """去掉指向树内真实图片、new/ 目录或已出现过的目标的文件符号链接，避免同一张图被处理多次；真实文件一律保留"""
+    real_dirs = {}
+    real_files = set()
+    for img_path, _, link_target in image_files:
+        if link_target is None:
+            parent = os.path.dirname(img_path)
+            if parent not in real_dirs: real_dirs[parent] = os.path.realpath(parent)
+            real_files.add(os.path.normcase(os.path.join(real_dirs[parent], os.path.basename(img_path))))
+    skip_dir_prefix = os.path.normcase(os.path.join(os.path.realpath(skip_dir_abs), ''))
+    seen_targets = set()
+    kept = []
+    for item in image_files:
+        link_target = item[2]
+        if link_target is not None:
+            if link_target in real_files or link_target in seen_targets or link_target.startswith(skip_dir_prefix):
+                continue
+            seen_targets.add(link_target)
+        kept.append(item)
+    return kept
+
+def get_all_image_files(input_folder, supported_formats, log_filename_val, path_meta=None):
+    """收集所有需要处理的图片文件路径, 跳过日志文件, 以及 input_folder/new/ 目录
+
+    传入 path_meta 字典时，顺带记录每个图片的 DirEntry.stat() 结果，供后续"已处理"判断复用。
+    """
     # new_output_dir_to_skip_abs 是 input_folder 下的 "new" 目录
     new_output_dir_to_skip_abs = os.path.abspath(os.path.join(input_folder, NEW_ROOT_OUTPUT_SUBFOLDER_NAME))
-    # config_file_abs_path_to_skip 是脚本目录下的 config.ini，通常不会在 input_folder 的扫描中遇到
-    # 但为了以防万一（如果脚本在 input_folder 中运行），我们不在这里特别处理它，
-    # 因为 os.walk(input_folder) 不会扫描到脚本目录（除非它们是同一个）
-
-    for current_dir_path, subdirectories, files_in_dir in os.walk(input_folder, topdown=True):
-        abs_current_dir_path = os.path.abspath(current_dir_path)
-
-        if abs_current_dir_path == new_output_dir_to_skip_abs:
-            subdirectories[:] = [] 
-            continue 
-
-        files_to_scan = list(files_in_dir)
+    # config.ini 位于脚本目录，通常不会在 input_folder 的扫描中遇到，因此不在这里特别处理
+    supported_exts = frozenset(fmt.lower() for fmt in supported_formats)
+    want_stat = path_meta is not None
+
+    # 各目录的 scandir/stat 在有限的线程中并发执行，网络盘上的元数据延迟可以重叠；线程数同时限制了打开的目录句柄数
+    scanned = {}
+    ancestor_dirs = {input_folder: frozenset()}  # 每个待扫描目录的祖先目录标识
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SCAN_THREADS, thread_name_prefix='scan') as executor:
         # 日志文件只在 input_folder 的根目录被跳过
-        if abs_current_dir_path == os.path.abspath(input_folder):
-            if log_filename_val in files_to_scan: files_to_scan.remove(log_filename_val)
-            # config.ini 不再从这里跳过，因为它与脚本同级
+        pending = {executor.submit(_scan_directory, input_folder, log_filename_val, supported_exts,
+                                   new_output_dir_to_skip_abs, want_stat): input_folder}
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                dir_path = pending.pop(future)
+                dir_identity, image_files, subdirectories = future.result()
+                ancestors = ancestor_dirs.pop(dir_path)
+                if dir_identity in ancestors:
+                    # Windows 目录联接（junction）不算符号链接，可能指回上层目录；遇到环时不再深入
+                    subdirectories = []
+                scanned[dir_path] = (dir_identity, image_files, subdirectories)
+                chain = ancestors | {dir_identity}
+                for subdirectory in subdirectories:
+                    ancestor_dirs[subdirectory] = chain
+                    pending[executor.submit(_scan_directory, subdirectory, None, supported_exts,
+                                            new_output_dir_to_skip_abs, want_stat)] = subdirectory
+
+    # 按 os.walk(topdown=True) 的先序拼接结果，输出顺序与串行遍历一致；
+    # 同一目录经联接等途径出现多次时只保留先序中的第一次，结果不受各线程完成先后影响
+    ordered_files = []
+    emitted_dirs = set()
+    stack = [input_folder]
+    while stack:
+        dir_identity, image_files, subdirectories = scanned[stack.pop()]
+        if dir_identity is not None:
+            if dir_identity in emitted_dirs: continue
+            emitted_dirs.add(dir_identity)
+        ordered_files.extend(image_files)
+        stack.extend(reversed(subdirectories))
+    if any(link_target is not None for _, _, link_target in ordered_files):
+        ordered_files = _drop_duplicate_links(ordered_files, new_output_dir_to_skip_abs)
 
-        for filename in files_to_scan:
-            if filename.lower().endswith(supported_formats):
-                all_files_to_process.append(os.path.join(current_dir_path, filename))
+    all_files_to_process = []
+    for img_path, stat_result, _ in ordered_files:
+        all_files_to_process.append(img_path)
+        if want_stat and stat_result is not None:
+            path_meta[img_path] = stat_result
     return all_files_to_process
 
+def _compute_target_size(original_width, original_height, config):
+    """按调整模式计算输出尺寸；处理流程与"已处理"判断共用，保证两处结果一致"""
+    resize_mode = config['resize_mode']
+    if resize_mode == 'fixed_height':
+        target_height = config['target_height']
+        if target_height > 0 and original_height != target_height:
+            return int(original_width * (target_height / float(original_height))), target_height
+    elif resize_mode == 'fixed_width':
+        target_width = config['target_width']
+        if target_width > 0 and original_width != target_width:
+            return target_width, int(original_height * (target_width / float(original_width)))
+    elif resize_mode == 'fit_bounds':
+        max_width, max_height = config['max_width'], config['max_height']
+        if max_width > 0 and max_height > 0 and (original_width > max_width or original_height > max_height):
+            ratio = min(max_width / float(original_width), max_height / float(original_height))
+            return int(original_width * ratio), int(original_height * ratio)
+    return original_width, original_height
+
 def calculate_target_output_dir(img_path, config):
     """计算给定图片在新结构下的最终输出目录路径"""
-    input_folder_root = config['input_folder_root']
-    base_new_output_root = os.path.join(input_folder_root, NEW_ROOT_OUTPUT_SUBFOLDER_NAME)
+    return _target_dir_for_parent(os.path.dirname(img_path), config['input_folder_root'])
 
-    original_image_parent_dir = os.path.dirname(img_path)
+@functools.lru_cache(maxsize=4096)
+def _target_dir_for_parent(original_image_parent_dir, input_folder_root):
+    """结果只取决于所在目录，按目录缓存，同一目录下的图片无需重复计算 relpath"""
+    base_new_output_root = os.path.join(input_folder_root, NEW_ROOT_OUTPUT_SUBFOLDER_NAME)
     relative_dir_from_input = os.path.relpath(original_image_parent_dir, input_folder_root)
 
     if relative_dir_from_input == '.': 
@@ -539,48 +854,242 @@ def calculate_target_output_dir(img_path, config):
     else:
         return os.path.join(base_new_output_root, relative_dir_from_input)
 
-def check_if_already_processed(img_path, cfg):
-    if cfg['overwrite_existing'] or cfg['is_dry_run']: return False
+def _load_image_size_cache(cache_path):
+    """读取源图尺寸缓存 {路径: [mtime_ns, 文件大小, 宽, 高]}，不存在或损坏时返回空字典。"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _save_image_size_cache(cache_path, size_cache):
+    """先写临时文件再替换，写入失败时保持旧缓存不变。"""
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(size_cache, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try: os.remove(tmp_path)
+        except OSError: pass
+
+def _read_image_size(img_path, size_cache=None, stat_result=None):
+    """只解析文件头读取图片尺寸；传入 size_cache 且源文件 mtime/大小未变时直接复用缓存。"""
+    if size_cache is None:
+        with Image.open(img_path) as img:
+            return img.size
+    if stat_result is None:
+        stat_result = os.stat(img_path)
+    cached = size_cache.get(img_path)
+    if cached is not None and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2], cached[3]
+    with Image.open(img_path) as img:
+        width, height = img.size
+    size_cache[img_path] = [stat_result.st_mtime_ns, stat_result.st_size, width, height]
+    return width, height
+
+def _expected_output_names(base, final_output_ext, is_split, cfg):
+    """按命名模板给出一张源图对应的输出文件名（切割时为两页，按页码顺序）"""
+    if cfg['enable_double_page_split'] and is_split:
+        return [cfg['template_split_page1'].format(base=base, ext=final_output_ext, page_num=1),
+                cfg['template_split_page2'].format(base=base, ext=final_output_ext, page_num=2)]
+    return [cfg['template_single'].format(base=base, ext=final_output_ext)]
+
+def _expected_output_paths(img_path, cfg, size_cache=None, stat_result=None):
+    """预测源图处理后应有的输出文件路径；无法读取源图尺寸时返回 None"""
     mirrored_target_dir = calculate_target_output_dir(img_path, cfg)
-    if not os.path.isdir(mirrored_target_dir): return False
-
-    original_filename = os.path.basename(img_path)
-    base, original_ext_str = os.path.splitext(original_filename)
-    original_ext_lower = original_ext_str.lower()
-    _, final_output_ext = get_dynamic_output_format_and_ext(original_ext_lower, cfg)
-
-    is_split_candidate = False
+    base, original_ext_str = os.path.splitext(os.path.basename(img_path))
+    _, final_output_ext = get_dynamic_output_format_and_ext(original_ext_str.lower(), cfg)
+    try:
+        # 判断是否切割只需要尺寸：Image.open 只解析文件头，不再 load() 解码像素
+        original_width, original_height = _read_image_size(img_path, size_cache, stat_result)
+        sim_width, sim_height = _compute_target_size(original_width, original_height, cfg)
+        is_split_candidate = sim_height > 0 and sim_width > sim_height
+    except (UnidentifiedImageError, FileNotFoundError, Exception): return None
+    return [os.path.join(mirrored_target_dir, name)
+            for name in _expected_output_names(base, final_output_ext, is_split_candidate, cfg)]
+
+def _list_output_dir(dir_path):
+    """一次 scandir 列出输出目录中的条目 {normcase(文件名): DirEntry}；目录不存在或不可读时返回空字典"""
     try:
-        with Image.open(img_path) as temp_img:
-            temp_img.load()
-            original_width, original_height = temp_img.size
-            sim_width, sim_height = original_width, original_height
-            if cfg['resize_mode'] != 'none':
-                if cfg['resize_mode'] == 'fixed_height' and cfg['target_height'] > 0 and original_height != cfg['target_height']:
-                    ratio = cfg['target_height'] / float(original_height); sim_width = int(original_width * ratio); sim_height = cfg['target_height']
-                elif cfg['resize_mode'] == 'fixed_width' and cfg['target_width'] > 0 and original_width != cfg['target_width']:
-                    ratio = cfg['target_width'] / float(original_width); sim_height = int(original_height * ratio); sim_width = cfg['target_width']
-                elif cfg['resize_mode'] == 'fit_bounds':
-                    if cfg['max_width'] > 0 and cfg['max_height'] > 0 and (original_width > cfg['max_width'] or original_height > cfg['max_height']):
-                        ratio = min(cfg['max_width']/float(original_width), cfg['max_height']/float(original_height))
-                        sim_width = int(original_width * ratio); sim_height = int(original_height * ratio)
-            is_split_candidate = sim_height > 0 and sim_width > sim_height
-    except (UnidentifiedImageError, FileNotFoundError, Exception): return False
-
-    expected_outputs = []
-    if cfg['enable_double_page_split'] and is_split_candidate:
-        page1_savename = cfg['template_split_page1'].format(base=base, ext=final_output_ext, page_num=1)
-        page2_savename = cfg['template_split_page2'].format(base=base, ext=final_output_ext, page_num=2)
-        expected_outputs.extend([os.path.join(mirrored_target_dir, page1_savename), os.path.join(mirrored_target_dir, page2_savename)])
+        with os.scandir(dir_path) as it:
+            return {os.path.normcase(entry.name): entry for entry in it}
+    except OSError:
+        return {}
+
+def _outputs_up_to_date(img_path, expected_outputs, stat_result=None, output_listings=None):
+    """所有输出文件都存在且不早于源文件时返回 True；传入 output_listings {目录: _list_output_dir 结果} 时不再逐个 stat 不存在的输出"""
+    if stat_result is not None:
+        source_mtime = stat_result.st_mtime
     else:
-        single_savename = cfg['template_single'].format(base=base, ext=final_output_ext)
-        expected_outputs.append(os.path.join(mirrored_target_dir, single_savename))
-    try: source_mtime = os.path.getmtime(img_path)
-    except FileNotFoundError: return False
+        try: source_mtime = os.path.getmtime(img_path)
+        except FileNotFoundError: return False
     for out_file in expected_outputs:
-        if not os.path.exists(out_file) or os.path.getmtime(out_file) < source_mtime: return False
+        # 一次 stat 同时判断存在性与修改时间
+        try:
+            if output_listings is not None:
+                entry = output_listings.get(os.path.dirname(out_file), {}).get(os.path.normcase(os.path.basename(out_file)))
+                if entry is None: return False
+                out_stat = entry.stat()  # Windows 上直接取自目录枚举结果，无需额外系统调用
+            else:
+                out_stat = os.stat(out_file)
+            if out_stat.st_mtime < source_mtime: return False
+        except OSError: return False
     return True
 
+def check_if_already_processed(img_path, cfg, size_cache=None, stat_result=None):
+    if cfg['overwrite_existing'] or cfg['is_dry_run']: return False
+    if not os.path.isdir(calculate_target_output_dir(img_path, cfg)): return False
+    expected_outputs = _expected_output_paths(img_path, cfg, size_cache, stat_result)
+    if expected_outputs is None: return False
+    return _outputs_up_to_date(img_path, expected_outputs, stat_result)
+
+def _output_config_fingerprint(cfg):
+    """影响输出内容的配置项；任一项变化后旧的内容记忆全部失效（命名模板只影响文件名，不计入）"""
+    return json.dumps([cfg[key] for key in ('resize_mode', 'target_height', 'target_width', 'max_height', 'max_width',
+                                            'output_format_for_others', 'jpeg_quality',
+                                            'enable_double_page_split', 'split_left_to_right')])
+
+def _content_key(img_path, config_fingerprint):
+    """对整个文件内容、扩展名与配置指纹计算内容键；只哈希文件开头时，共用文件头的不同页面可能撞键而被复制成错误的输出"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(img_path, 'rb') as f:
+        for block in iter(lambda: f.read(CONTENT_KEY_READ_BYTES), b''):
+            digest.update(block)
+    digest.update(f"|{os.path.splitext(img_path)[1].lower()}|{config_fingerprint}".encode('utf-8'))
+    return digest.hexdigest()
+
+def _open_output_memo(output_root):
+    """打开 new/ 下的内容记忆库 {内容键: 源文件大小与输出文件列表}；无法打开时返回 None，相当于不启用"""
+    try:
+        conn = sqlite3.connect(os.path.join(output_root, OUTPUT_MEMO_FILENAME))
+        # memo.outputs 为 [[相对路径, 大小, mtime_ns], ...]；memo_outputs 记录每个输出文件当前属于哪个内容键
+        conn.execute("CREATE TABLE IF NOT EXISTS memo (content_key TEXT PRIMARY KEY, source_size INTEGER NOT NULL, outputs TEXT NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS memo_outputs (rel_path TEXT PRIMARY KEY, content_key TEXT NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS memo_outputs_key ON memo_outputs (content_key)")
+        return conn
+    except sqlite3.Error as e:
+        logging.warning(f"无法打开内容记忆库，本次不复用历史输出: {e}")
+        return None
+
+def _memoized_source_sizes(memo):
+    """记忆库中出现过的源文件大小；大小不在其中的图片不可能命中，无需计算内容键"""
+    try:
+        return {row[0] for row in memo.execute("SELECT DISTINCT source_size FROM memo")}
+    except sqlite3.Error as e:
+        logging.warning(f"读取内容记忆库失败，本次不复用历史输出: {e}")
+        return set()
+
+def _reuse_memoized_outputs(memo, content_key, expected_outputs, output_root):
+    """同内容的图片曾处理过且旧输出仍在时，直接复制旧输出到新位置，省去解码、缩放与编码；成功返回 True"""
+    row = memo.execute("SELECT outputs FROM memo WHERE content_key = ?", (content_key,)).fetchone()
+    if row is None: return False
+    previous_outputs = json.loads(row[0])
+    if len(previous_outputs) != len(expected_outputs): return False
+    for rel_path, size, mtime_ns in previous_outputs:
+        # 旧输出记录后又被覆盖写入（例如该位置换成了另一张图的输出）时大小或修改时间必然变化，不能再复用
+        try: stat_result = os.stat(os.path.join(output_root, rel_path))
+        except OSError: return False
+        if stat_result.st_size != size or stat_result.st_mtime_ns != mtime_ns: return False
+    previous_outputs = [os.path.join(output_root, rel_path) for rel_path, _, _ in previous_outputs]
+    try:
+        for src, dst in zip(previous_outputs, expected_outputs):
+            if os.path.normcase(os.path.abspath(src)) == os.path.normcase(os.path.abspath(dst)):
+                os.utime(dst)  # 输出本身就在原位，只需刷新修改时间让"已处理"判断通过
+                continue
+            tmp_path = f"{dst}.{os.getpid()}.tmp"
+            shutil.copyfile(src, tmp_path)
+            os.replace(tmp_path, dst)
+    except OSError as e:
+        logging.warning(f"复用历史输出失败，将重新处理 ({os.path.basename(expected_outputs[0])}): {e}")
+        return False
+    return True
+
+def _record_memoized_outputs(memo, entries, output_root):
+    """把 (内容键, 源图路径, 输出路径列表) 连同各输出文件当前的大小与修改时间写入记忆库；同一输出文件只归属最新写入它的内容键"""
+    rows = []
+    for key, img_path, outputs in entries:
+        try:
+            source_size = os.stat(img_path).st_size
+            output_stats = [os.stat(p) for p in outputs]
+        except OSError:
+            continue
+        rel_paths = [os.path.relpath(p, output_root) for p in outputs]
+        rows.append((key, source_size, rel_paths,
+                     json.dumps([[rel_path, st.st_size, st.st_mtime_ns] for rel_path, st in zip(rel_paths, output_stats)],
+                                ensure_ascii=False)))
+    try:
+        with memo:
+            for key, source_size, rel_paths, outputs_json in rows:
+                # 输出文件已被本次写入覆盖，先前指向这些文件的记录一并删除
+                stale_keys = {key}
+                for rel_path in rel_paths:
+                    row = memo.execute("SELECT content_key FROM memo_outputs WHERE rel_path = ?", (rel_path,)).fetchone()
+                    if row is not None: stale_keys.add(row[0])
+                memo.executemany("DELETE FROM memo WHERE content_key = ?", [(k,) for k in stale_keys])
+                memo.executemany("DELETE FROM memo_outputs WHERE content_key = ?", [(k,) for k in stale_keys])
+                memo.execute("INSERT INTO memo (content_key, source_size, outputs) VALUES (?, ?, ?)", (key, source_size, outputs_json))
+                memo.executemany("INSERT INTO memo_outputs (rel_path, content_key) VALUES (?, ?)", [(p, key) for p in rel_paths])
+    except sqlite3.Error as e:
+        logging.warning(f"写入内容记忆库失败: {e}")
+
+def _open_source_file(img_path):
+    """以二进制方式打开源图；支持 posix_fadvise 的系统上提示内核顺序读取并立即预读整个文件。"""
+    source_file = open(img_path, 'rb')
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(source_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(source_file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass # 仅为性能提示，部分文件系统不支持
+    return source_file
+
+_WRITE_POOL = None # 每个工作进程内的写盘线程，按需创建
+
+def _get_write_pool():
+    global _WRITE_POOL
+    if _WRITE_POOL is None:
+        _WRITE_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='write')
+    return _WRITE_POOL
+
+def _write_bytes(path, data):
+    """先写临时文件再替换，中途失败不会留下被"已处理"判断误认为完成的半截输出。"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp" # 带上进程号与线程号，同时运行的多个任务不会互相覆盖临时文件
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+_VIPS_BANDS_FOR_MODE = {'1': 1, 'L': 1, 'LA': 2, 'RGB': 3, 'RGBA': 4} # Pillow 模式对应的 libvips 8 位解码通道数
+_MODE_FOR_VIPS_BANDS = {1: 'L', 2: 'LA', 3: 'RGB', 4: 'RGBA'}
+
+def _decode_png_with_vips(img_path, header_img):
+    """用 libvips（通常基于 libspng）解码 8 位 PNG，比 Pillow 的 zlib 解码快；通道布局与 Pillow 缩放前的结果不一致或解码失败时返回 None。"""
+    if pyvips is None: return None
+    if header_img.mode == 'P': expected_bands = 4 if 'transparency' in header_img.info else 3
+    else: expected_bands = _VIPS_BANDS_FOR_MODE.get(header_img.mode)
+    if expected_bands is None: return None
+    try:
+        vips_img = pyvips.Image.new_from_file(img_path, access='sequential')
+        if vips_img.format != 'uchar' or vips_img.bands != expected_bands: return None
+        data = vips_img.write_to_memory()
+    except pyvips.Error:
+        return None
+    mode = _MODE_FOR_VIPS_BANDS[expected_bands]
+    img = Image.frombuffer(mode, (vips_img.width, vips_img.height), data, 'raw', mode, 0, 1)
+    img.info = {key: value for key, value in header_img.info.items() if key != 'transparency'} # 透明度已展开为 alpha 通道
+    return img
+
+def _encode_image(img, save_format, save_options):
+    buffer = io.BytesIO()
+    img.save(buffer, format=save_format, **save_options)
+    return buffer.getbuffer()
+
 def worker_process_image(img_path, config):
     filename = os.path.basename(img_path)
     original_base, original_ext_str = os.path.splitext(filename)
@@ -589,28 +1098,34 @@ def worker_process_image(img_path, config):
     mirrored_target_dir = calculate_target_output_dir(img_path, config)
 
     try:
-        img = Image.open(img_path)
-        original_width, original_height = img.size
-        img.load()
+        with _open_source_file(img_path) as source_file:
+            img = Image.open(source_file)
+            original_width, original_height = img.size
+            new_width, new_height = _compute_target_size(original_width, original_height, config)
+            if img.format == 'JPEG' and new_width * 2 <= original_width and new_height * 2 <= original_height:
+                # 大幅缩小的 JPEG 让 libjpeg 直接按 1/2~1/8 做 DCT 缩放解码，仍保留至少 2 倍于目标的像素供 LANCZOS 使用
+                img.draft(None, (new_width * 2, new_height * 2))
+            vips_img = None
+            if img.format == 'PNG' and (new_width != original_width or new_height != original_height):
+                # 需要缩放的 PNG 交给 libvips 解码；文件头信息（ICC 等）仍取自 Pillow
+                vips_img = _decode_png_with_vips(img_path, img)
+            if vips_img is not None:
+                img.close()
+                img = vips_img
+            else:
+                img.load()
         if final_save_format == 'JPEG' and (img.mode == 'RGBA' or img.mode == 'LA' or (img.mode == 'P' and 'transparency' in img.info)):
             img = img.convert('RGB')
         elif final_save_format == 'PNG' and img.mode == 'P' and 'transparency' in img.info:
             img = img.convert('RGBA')
 
         resized_img = img
-        new_width, new_height = original_width, original_height
-        if config['resize_mode'] != 'none':
-            if config['resize_mode'] == 'fixed_height' and config['target_height'] > 0 and original_height != config['target_height']:
-                ratio = config['target_height'] / float(original_height); new_width = int(original_width * ratio); new_height = config['target_height']
-            elif config['resize_mode'] == 'fixed_width' and config['target_width'] > 0 and original_width != config['target_width']:
-                ratio = config['target_width'] / float(original_width); new_height = int(original_height * ratio); new_width = config['target_width']
-            elif config['resize_mode'] == 'fit_bounds':
-                if config['max_width'] > 0 and config['max_height'] > 0 and (original_width > config['max_width'] or original_height > config['max_height']):
-                    ratio = min(config['max_width']/float(original_width), config['max_height']/float(original_height))
-                    new_width = int(original_width * ratio); new_height = int(original_height * ratio)
-            if new_width != original_width or new_height != original_height:
-                try: resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                except AttributeError: resized_img = img.resize((new_width, new_height), Image.ANTIALIAS)
+        if new_width != original_width or new_height != original_height:
+            # 调色板/二值图 resize 时会被强制退化为最近邻，先转成 8 位通道图才能真正走 LANCZOS
+            # （Pillow-SIMD 的向量化缩放内核同样只针对 8 位 L/RGB/RGBA 图）
+            if img.mode == 'P': img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+            elif img.mode == '1': img = img.convert('L')
+            resized_img = _resize_image(img, (new_width, new_height), use_gpu=config.get('use_gpu', False))
         
         current_width, current_height = resized_img.size
         is_split_action = False
@@ -626,17 +1141,21 @@ def worker_process_image(img_path, config):
             save_path_p1 = os.path.join(mirrored_target_dir, page1_savename)
             save_path_p2 = os.path.join(mirrored_target_dir, page2_savename)
             if not config['is_dry_run']:
-                if config['split_left_to_right']:
-                    page_left_data.save(save_path_p1, format=final_save_format, **save_options)
-                    page_right_data.save(save_path_p2, format=final_save_format, **save_options)
-                else: 
-                    page_right_data.save(save_path_p1, format=final_save_format, **save_options)
-                    page_left_data.save(save_path_p2, format=final_save_format, **save_options)
+                if config['split_left_to_right']: pages = ((save_path_p1, page_left_data), (save_path_p2, page_right_data))
+                else: pages = ((save_path_p1, page_right_data), (save_path_p2, page_left_data))
+                if config.get('use_threads', False):
+                    # 线程模式下其它工作线程本就在并行编码，顺序写盘即可，免得所有线程挤在同一个写盘线程上
+                    for save_path, page in pages: _write_bytes(save_path, _encode_image(page, final_save_format, save_options))
+                else:
+                    # 第一页在后台线程写盘的同时编码第二页；两页都写完才返回，结果与日志保持准确
+                    write_futures = [_get_write_pool().submit(_write_bytes, save_path, _encode_image(page, final_save_format, save_options))
+                                     for save_path, page in pages]
+                    for future in write_futures: future.result()
         else: # No split
             save_filename = config['template_single'].format(base=original_base, ext=final_output_ext)
             save_path = os.path.join(mirrored_target_dir, save_filename)
             if not config['is_dry_run']:
-                resized_img.save(save_path, format=final_save_format, **save_options)
+                _write_bytes(save_path, _encode_image(resized_img, final_save_format, save_options))
         img.close()
         # 使用 input_folder_root 计算相对路径用于日志
         log_output_path = os.path.relpath(mirrored_target_dir, config['input_folder_root'])
@@ -646,6 +1165,14 @@ def worker_process_image(img_path, config):
     except Exception as e: return "error", f"处理 '{filename}' 错误: {str(e)}", filename, False
 
 def process_images_with_config(cfg, config_file_path_abs=None, *, additional_log_handlers=None, include_console_log=True):
+    """按配置执行完整处理流程并返回统计摘要；返回前确保缓冲的日志已全部写入文件。"""
+    try:
+        return _process_images_with_config(cfg, config_file_path_abs, additional_log_handlers=additional_log_handlers,
+                                           include_console_log=include_console_log)
+    finally:
+        _flush_log_handlers()
+
+def _process_images_with_config(cfg, config_file_path_abs=None, *, additional_log_handlers=None, include_console_log=True):
     input_folder = cfg['input_folder_root']
     log_file_path = os.path.join(input_folder, cfg['log_filename'])
     setup_logging(log_file_path, cfg['is_dry_run'], additional_handlers=additional_log_handlers, include_console=include_console_log)
@@ -654,10 +1181,15 @@ def process_images_with_config(cfg, config_file_path_abs=None, *, additional_log
     if config_file_path_abs:
         logging.info(f"配置文件: {config_file_path_abs}")
     logging.info(f"输出镜像根目录: {os.path.join(input_folder, NEW_ROOT_OUTPUT_SUBFOLDER_NAME)}")
+    if _jpeg_codec_is_turbo() is False:
+        logging.warning("当前 Pillow 未链接 libjpeg-turbo，JPEG 解码/编码会明显变慢；建议改用官方 Pillow wheel 或 Pillow-SIMD。")
 
     supported_formats = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff', '.webp')
     logging.info("步骤1: 扫描所有图片文件...")
-    all_image_paths_discovered = get_all_image_files(input_folder, supported_formats, cfg['log_filename'])
+    # 需要判断"已处理"时才在扫描中顺带收集文件元数据
+    use_size_cache = not cfg['overwrite_existing'] and not cfg['is_dry_run']
+    path_meta = {} if use_size_cache else None
+    all_image_paths_discovered = get_all_image_files(input_folder, supported_formats, cfg['log_filename'], path_meta)
     if not all_image_paths_discovered:
         logging.info("未找到支持的图片文件。")
         logging.info("--- 处理结束 ---")
@@ -698,8 +1230,19 @@ def process_images_with_config(cfg, config_file_path_abs=None, *, additional_log
     tasks_to_process = []
     unique_original_parent_dirs = sorted(list(set(os.path.dirname(p) for p in all_image_paths_discovered)))
 
+    mirrored_target_dirs = {parent_dir: calculate_target_output_dir(os.path.join(parent_dir, "dummy.file"), cfg)
+                            for parent_dir in unique_original_parent_dirs}
+    wipe_errors = {}
+    if not cfg['is_dry_run'] and cfg['overwrite_existing']:
+        # 先并行清空所有已存在的镜像目录（子目录随祖先目录一起删除），再逐个重建
+        dirs_to_wipe = [d for d in (mirrored_target_dirs[p] for p in unique_original_parent_dirs) if os.path.exists(d)]
+        wipe_roots = _outermost_dirs(dirs_to_wipe)
+        for wipe_dir in wipe_roots:
+            logging.info(f"镜像目标文件夹 '{wipe_dir}' 已存在，将清空。")
+        wipe_errors = _remove_trees_parallel(wipe_roots, cfg['num_processes'])
+
     for original_parent_dir in unique_original_parent_dirs:
-        mirrored_target_dir = calculate_target_output_dir(os.path.join(original_parent_dir, "dummy.file"), cfg)
+        mirrored_target_dir = mirrored_target_dirs[original_parent_dir]
 
         if cfg['is_dry_run']:
             if not os.path.exists(mirrored_target_dir):
@@ -707,16 +1250,11 @@ def process_images_with_config(cfg, config_file_path_abs=None, *, additional_log
             elif cfg['overwrite_existing']:
                 logging.info(f"[试运行] 镜像目标文件夹 '{mirrored_target_dir}' 中的内容将被覆盖。")
         else:
-            if os.path.exists(mirrored_target_dir):
-                if cfg['overwrite_existing']:
-                    logging.info(f"镜像目标文件夹 '{mirrored_target_dir}' 已存在，将清空。")
-                    try:
-                        shutil.rmtree(mirrored_target_dir)
-                        os.makedirs(mirrored_target_dir)
-                    except OSError as e:
-                        logging.error(f"错误：无法清空/创建镜像目标文件夹 '{mirrored_target_dir}': {e}。")
-                        all_image_paths_discovered = [p for p in all_image_paths_discovered if os.path.dirname(p) != original_parent_dir]
-                        continue
+            failed_wipe_dir = _find_covering_dir(mirrored_target_dir, wipe_errors)
+            if failed_wipe_dir is not None:
+                logging.error(f"错误：无法清空/创建镜像目标文件夹 '{mirrored_target_dir}': {wipe_errors[failed_wipe_dir]}。")
+                all_image_paths_discovered = [p for p in all_image_paths_discovered if os.path.dirname(p) != original_parent_dir]
+                continue
             else:
                 try:
                     os.makedirs(mirrored_target_dir, exist_ok=True)
@@ -726,18 +1264,68 @@ def process_images_with_config(cfg, config_file_path_abs=None, *, additional_log
                     continue
 
     skipped_due_to_cache = 0
+    size_cache_path = os.path.join(base_new_output_dir_root, IMAGE_SIZE_CACHE_FILENAME)
+    previous_size_cache = _load_image_size_cache(size_cache_path) if use_size_cache else {}
+    size_cache = {}
+    target_dir_exists = {}  # 同一目录下的图片共用一次 isdir 结果
+    pending_checks = []
     for img_path in all_image_paths_discovered:
-        mirrored_target_dir = calculate_target_output_dir(img_path, cfg)
-        if not cfg['is_dry_run'] and not os.path.isdir(mirrored_target_dir):
-            continue
-        if not cfg['overwrite_existing'] and check_if_already_processed(img_path, cfg):
-            skipped_due_to_cache += 1
-            continue
-        tasks_to_process.append((img_path, cfg))
+        if not cfg['is_dry_run']:
+            mirrored_target_dir = calculate_target_output_dir(img_path, cfg)
+            exists = target_dir_exists.get(mirrored_target_dir)
+            if exists is None:
+                exists = target_dir_exists[mirrored_target_dir] = os.path.isdir(mirrored_target_dir)
+            if not exists:
+                continue
+        if use_size_cache:
+            # 只沿用本次仍存在的源文件条目，已删除图片的记录随之淘汰
+            if img_path in previous_size_cache:
+                size_cache[img_path] = previous_size_cache[img_path]
+            pending_checks.append(img_path)
+        else:
+            tasks_to_process.append(img_path)
+    # 覆盖模式也打开记忆库：不查询复用，但要记录本次重写的输出，避免旧记录指向已被改写的文件
+    output_memo = _open_output_memo(base_new_output_dir_root) if not cfg['is_dry_run'] else None
+    config_fingerprint = _output_config_fingerprint(cfg)
+    memo_sizes = _memoized_source_sizes(output_memo) if output_memo is not None and use_size_cache else set()
+    memo_entries = []  # 本次复用的历史输出，复制/刷新后文件的修改时间已变化，需要重新记录
+    reused_from_memo = 0
+    if pending_checks:
+        # "已处理"判断以 stat 与读取文件头为主，属于 I/O 等待，用线程并发执行；map 保持原有顺序
+        output_listings = {}
+        def check_outputs(img_path):
+            stat_result = path_meta.get(img_path)
+            expected_outputs = _expected_output_paths(img_path, cfg, size_cache, stat_result)
+            if expected_outputs is None: return False, None, None
+            if _outputs_up_to_date(img_path, expected_outputs, stat_result, output_listings): return True, expected_outputs, None
+            # 先按文件名判断，未命中且记忆库里有同样大小的源文件时才读取整个文件计算内容键
+            if stat_result is None or stat_result.st_size not in memo_sizes: return False, expected_outputs, None
+            try: return False, expected_outputs, _content_key(img_path, config_fingerprint)
+            except OSError: return False, expected_outputs, None
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, cfg['num_processes'] * 4)) as executor:
+            # 每个输出目录只 scandir 一次，之后按文件名查表，代替逐个输出文件的 stat
+            output_dirs = list(dict.fromkeys(calculate_target_output_dir(p, cfg) for p in pending_checks))
+            output_listings.update(zip(output_dirs, executor.map(_list_output_dir, output_dirs)))
+            for img_path, (processed, expected_outputs, content_key) in zip(pending_checks, executor.map(check_outputs, pending_checks)):
+                if processed:
+                    skipped_due_to_cache += 1
+                elif content_key is not None and _reuse_memoized_outputs(output_memo, content_key, expected_outputs, base_new_output_dir_root):
+                    skipped_due_to_cache += 1
+                    reused_from_memo += 1
+                    memo_entries.append((content_key, img_path, expected_outputs))
+                else:
+                    tasks_to_process.append(img_path)
+    if memo_entries:
+        _record_memoized_outputs(output_memo, memo_entries, base_new_output_dir_root)
+    if use_size_cache and size_cache != previous_size_cache:
+        _save_image_size_cache(size_cache_path, size_cache)
 
     if skipped_due_to_cache > 0:
         logging.info(f"智能跳过: {skipped_due_to_cache} 个文件因已处理且最新而被跳过。")
+    if reused_from_memo > 0:
+        logging.info(f"其中 {reused_from_memo} 个文件与之前处理过的图片内容相同，已直接复制历史输出。")
     if not tasks_to_process:
+        if output_memo is not None: output_memo.close()
         logging.info("没有需要处理的图片任务。")
         logging.info("--- 处理结束 ---")
         return {
@@ -755,31 +1343,64 @@ def process_images_with_config(cfg, config_file_path_abs=None, *, additional_log
     total_processed_count = 0
     total_split_count = 0
     total_errors = 0
+    # 大目录、大文件先派发（近似 LPT）：池内进程动态取任务，收尾阶段多为小图；同目录任务仍保持相邻，
+    # 每批任务写入同一输出目录（见 get_all_image_files 的先序顺序）
+    tasks_to_process = _largest_first(tasks_to_process, path_meta)
+    num_workers = cfg['num_processes'] * 2 if cfg.get('use_threads', False) else cfg['num_processes']
+    memory_limit = _memory_worker_limit(tasks_to_process, cfg, size_cache)
+    if memory_limit is not None and memory_limit < num_workers:
+        # 配置值只作为上限：大尺寸页面时按可用内存减少并行数，避免换页抖动或 OOM
+        logging.warning(f"可用内存约可同时处理 {memory_limit} 张图片，并行数由 {num_workers} 降为 {memory_limit}。")
+        num_workers = memory_limit
+    processing_start = time.perf_counter()
+    interrupted = False
     try:
-        with multiprocessing.Pool(processes=cfg['num_processes']) as pool:
-            results = []
-            with tqdm(total=len(tasks_to_process), desc="图片处理进度", unit="张") as pbar:
-                for result in pool.imap_unordered(worker_process_image_wrapper, tasks_to_process):
+        results = []
+        # 内容键在工作进程中处理成功后计算，此时源文件多半仍在页缓存中，不必在筛选阶段为每张图多读一遍
+        worker_cfg = dict(cfg, memo_fingerprint=config_fingerprint if output_memo is not None else None)
+        task_results = _iter_task_results(tasks_to_process, worker_cfg, num_workers)
+        with tqdm(total=len(tasks_to_process), desc="图片处理进度", unit="张") as pbar:
+            try:
+                for result in task_results:
                     results.append(result)
+                    if result[1][0] == "error":
+                        logging.error(result[1][1])  # 错误随完成即时输出，不必等全部图片处理完
                     pbar.update(1)
-        for status, message, _, is_split in results:
+            except KeyboardInterrupt:
+                # 已完成的图片照常统计并记入内容记忆库，未开始的任务不再执行
+                interrupted = True
+                logging.warning(f"处理被用户中断，已完成 {len(results)}/{len(tasks_to_process)} 张，其余任务已取消。")
+            finally:
+                task_results.close()
+        memo_entries = []
+        for img_path, (status, message, _, is_split), content_key in results:
             if status == "success":
                 total_processed_count += 1
                 if is_split:
                     total_split_count += 1
                 logging.info(message)
+                if content_key is not None:
+                    base, original_ext_str = os.path.splitext(os.path.basename(img_path))
+                    _, final_output_ext = get_dynamic_output_format_and_ext(original_ext_str.lower(), cfg)
+                    mirrored_target_dir = calculate_target_output_dir(img_path, cfg)
+                    memo_entries.append((content_key, img_path, [os.path.join(mirrored_target_dir, name) for name in
+                                                                 _expected_output_names(base, final_output_ext, is_split, cfg)]))
             elif status == "error":
                 total_errors += 1
-                logging.error(message)
+        if memo_entries:
+            _record_memoized_outputs(output_memo, memo_entries, base_new_output_dir_root)
     except Exception as e:
         logging.critical(f"多进程处理中发生严重错误: {e}", exc_info=True)
         total_errors = len(tasks_to_process)
+    finally:
+        if output_memo is not None: output_memo.close()
 
     logging.info("\n--- 处理结束 ---")
     if cfg['is_dry_run']:
         logging.info("“试运行”模式结束。")
     logging.info(f"总共成功处理了 {total_processed_count} 张图片。")
     logging.info(f"其中 {total_split_count} 张图片被切割。")
+    logging.info(f"处理耗时 {time.perf_counter() - processing_start:.1f} 秒（{'线程' if cfg.get('use_threads', False) else '进程'}模式）。")
     if skipped_due_to_cache > 0 and not cfg['overwrite_existing']:
         logging.info(f"{skipped_due_to_cache} 张图片因已处理且最新而被跳过。")
     if total_errors > 0:
@@ -792,9 +1413,11 @@ def process_images_with_config(cfg, config_file_path_abs=None, *, additional_log
         'skipped_due_to_cache': skipped_due_to_cache,
         'total_errors': total_errors,
         'total_discovered': len(all_image_paths_discovered),
-        'total_to_process': len(tasks_to_process),
+        # 中断时只计入实际执行完的任务，被取消的另行给出
+        'total_to_process': len(results) if interrupted else len(tasks_to_process),
+        'total_cancelled': len(tasks_to_process) - len(results) if interrupted else 0,
         'log_file_path': log_file_path,
-        'status': 'completed'
+        'status': 'interrupted' if interrupted else 'completed'
     }
 
 
@@ -898,24 +1521,134 @@ def process_manga_folder_recursive():
     }
 
 
-def process_manga_folder_recursive():
-    input_folder = input("请输入漫画根文件夹的路径: ").strip()
+def process_manga_folder_recursive(input_folder=None, config_file_path_abs=None, interactive=True, use_gpu=False, use_threads=False):
+    if input_folder is None:
+        input_folder = input("请输入漫画根文件夹的路径: ").strip()
     if not os.path.isdir(input_folder):
         print(f"错误：文件夹 '{input_folder}' 不存在。")
         return
 
-    script_directory = get_script_directory()
-    config_file_path_abs = os.path.join(script_directory, CONFIG_FILENAME) # config.ini 与脚本同级
+    if config_file_path_abs is None:
+        script_directory = get_script_directory()
+        config_file_path_abs = os.path.join(script_directory, CONFIG_FILENAME) # config.ini 与脚本同级
 
-    cfg = load_or_get_config(config_file_path_abs, input_folder) # 传递绝对配置文件路径
+    cfg = load_or_get_config(config_file_path_abs, input_folder, interactive=interactive) # 传递绝对配置文件路径
+    cfg['use_gpu'] = use_gpu
+    cfg['use_threads'] = use_threads
 
     process_images_with_config(cfg, config_file_path_abs=config_file_path_abs)
 
+def parse_command_line(argv=None):
+    """解析命令行参数；不带参数运行时保持原有的逐项提示流程。"""
+    parser = argparse.ArgumentParser(description="批量缩放/切割漫画图片，输出到输入目录下的 new/。")
+    parser.add_argument('input_folder', nargs='?', help="漫画根文件夹；省略时运行后提示输入")
+    parser.add_argument('--config', help=f"配置文件路径 (默认: 脚本目录下的 {CONFIG_FILENAME})")
+    parser.add_argument('--non-interactive', action='store_true',
+                        help="不逐项提示，直接使用配置文件中的设置（需同时给出 input_folder）")
+    parser.add_argument('--gpu', action='store_true',
+                        help="尝试用带 CUDA 的 OpenCV 在显卡上缩放；不可用时自动退回 CPU")
+    parser.add_argument('--threads', action='store_true',
+                        help="用线程池代替进程池处理图片（线程数为进程数的 2 倍），省去子进程启动与内存开销")
+    args = parser.parse_args(argv)
+    if args.non_interactive and not args.input_folder:
+        parser.error("--non-interactive 需要同时给出 input_folder")
+    return args
+
 def worker_process_image_wrapper(args): return worker_process_image(*args)
 
+_WORKER_CONFIG = None # 子进程内由 _init_worker 设置的处理配置
+
+def _init_worker(config):
+    """进程池初始化函数：每个子进程只接收一次配置。"""
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+
+def _process_image_task(img_path, config):
+    """处理单张图片并返回 (图片路径, 处理结果, 内容键)；配置带 memo_fingerprint 时对处理成功的源图计算内容键"""
+    result = worker_process_image(img_path, config)
+    content_key = None
+    if result[0] == "success" and config.get('memo_fingerprint') is not None:
+        try: content_key = _content_key(img_path, config['memo_fingerprint'])
+        except OSError: pass
+    return img_path, result, content_key
+
+def worker_process_image_task(img_path): return _process_image_task(img_path, _WORKER_CONFIG)
+
+def _iter_task_results(tasks_to_process, cfg, num_workers):
+    """按完成顺序逐个产出 (图片路径, 处理结果, 内容键)；默认用进程池，use_threads 时改用线程池（Pillow/OpenCV 解码、缩放、编码期间会释放 GIL）"""
+    if cfg.get('use_threads', False):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix='image') as executor:
+            futures = [executor.submit(_process_image_task, img_path, cfg) for img_path in tasks_to_process]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    yield future.result()
+            finally:
+                # 中途中断或调用方提前停止时取消尚未开始的任务，退出时只需等待正在处理的几张
+                for future in futures: future.cancel()
+        return
+    # cfg 只在进程启动时经 initializer 传一次，任务本身只携带图片路径；提前退出 with 时进程池会被 terminate
+    with multiprocessing.Pool(processes=num_workers, initializer=_init_worker, initargs=(cfg,)) as pool:
+        chunksize = _task_chunksize(len(tasks_to_process), num_workers)
+        yield from pool.imap_unordered(worker_process_image_task, tasks_to_process, chunksize=chunksize)
+
+def _largest_first(tasks_to_process, path_meta=None):
+    """同一目录的任务保持相邻，目录按总字节数、目录内按文件大小从大到小排列；优先复用扫描时记录的 stat 结果。"""
+    def file_size(img_path):
+        stat_result = path_meta.get(img_path) if path_meta else None
+        if stat_result is None:
+            try: stat_result = os.stat(img_path)
+            except OSError: return 0
+        return stat_result.st_size
+    groups = {}  # 目录 -> [(大小, 路径)]，保持目录首次出现的顺序
+    for img_path in tasks_to_process:
+        groups.setdefault(os.path.dirname(img_path), []).append((file_size(img_path), img_path))
+    ordered_groups = sorted(groups.values(), key=lambda group: sum(size for size, _ in group), reverse=True)
+    return [img_path for group in ordered_groups
+            for _, img_path in sorted(group, key=lambda item: item[0], reverse=True)]
+
+def _available_memory_bytes():
+    """当前可用物理内存字节数（含可回收的页缓存）；无法获取时返回 None。"""
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    try:
+        # Linux 内核给出的 MemAvailable 已计入可回收的页缓存，与 psutil 的 available 一致
+        with open('/proc/meminfo', 'rb') as meminfo:
+            for line in meminfo:
+                if line.startswith(b'MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        # 最后手段：SC_AVPHYS_PAGES 只相当于 MemFree，不含页缓存，会明显低估
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def _memory_worker_limit(tasks_to_process, cfg, size_cache=None):
+    """按抽样图片中最大的源图与输出像素数估算每个并行任务的内存占用，返回可用内存能同时容纳的任务数；无法估算时返回 None。"""
+    available = _available_memory_bytes()
+    if not available: return None
+    step = max(1, len(tasks_to_process) // WORKER_MEMORY_SAMPLE_COUNT)
+    max_task_bytes = 0
+    for img_path in tasks_to_process[::step][:WORKER_MEMORY_SAMPLE_COUNT]:
+        try: width, height = _read_image_size(img_path, size_cache)
+        except Exception: continue
+        # 放大时输出缓冲远大于源图，两者都要计入
+        output_width, output_height = _compute_target_size(width, height, cfg)
+        max_task_bytes = max(max_task_bytes, width * height * WORKER_BYTES_PER_SOURCE_PIXEL
+                             + output_width * output_height * WORKER_BYTES_PER_OUTPUT_PIXEL)
+    if not max_task_bytes: return None
+    return max(1, available // max_task_bytes)
+
+def _task_chunksize(task_count, num_processes):
+    """每批派发的任务数：约为每个进程 8 批，上限 16 张，兼顾 IPC 开销与负载均衡。"""
+    return max(1, min(16, task_count // (max(1, num_processes) * 8)))
+
 if __name__ == "__main__":
     multiprocessing.freeze_support() 
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-    try: process_manga_folder_recursive()
+    cli_args = parse_command_line()
+    config_path_arg = os.path.abspath(cli_args.config) if cli_args.config else None
+    try: process_manga_folder_recursive(cli_args.input_folder, config_path_arg, interactive=not cli_args.non_interactive, use_gpu=cli_args.gpu, use_threads=cli_args.threads)
     except Exception as e: logging.critical(f"脚本发生未捕获的致命错误: {e}", exc_info=True); print(f"脚本因严重错误终止，请检查日志。")
 